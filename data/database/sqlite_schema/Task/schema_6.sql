@@ -0,0 +1,39 @@
+-- direct PAS
+-- Python Application Services
+--
+-- (C) direct Netware Group - All rights reserved
+-- https://www.direct-netware.de/redirect?pas;tasks
+--
+-- The following license agreement remains valid unless any additions or
+-- changes are being made by direct Netware Group in a written form.
+--
+-- This program is free software; you can redistribute it and/or modify it
+-- under the terms of the GNU General Public License as published by the
+-- Free Software Foundation; either version 2 of the License, or (at your
+-- option) any later version.
+--
+-- This program is distributed in the hope that it will be useful, but WITHOUT
+-- ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+-- FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+-- more details.
+--
+-- You should have received a copy of the GNU General Public License along with
+-- this program; if not, write to the Free Software Foundation, Inc.,
+-- 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+--
+-- https://www.direct-netware.de/redirect?licenses;gpl
+
+
+-- Restore indices lost while rebuilding the table for schema version 3
+
+CREATE INDEX IF NOT EXISTS ix___db_prefix___task_tid ON __db_prefix___task (tid);
+CREATE INDEX IF NOT EXISTS ix___db_prefix___task_name ON __db_prefix___task (name);
+CREATE INDEX IF NOT EXISTS ix___db_prefix___task_status ON __db_prefix___task (status);
+CREATE INDEX IF NOT EXISTS ix___db_prefix___task_hook ON __db_prefix___task (hook);
+CREATE INDEX IF NOT EXISTS ix___db_prefix___task_time_scheduled ON __db_prefix___task (time_scheduled);
+CREATE INDEX IF NOT EXISTS ix___db_prefix___task_time_updated ON __db_prefix___task (time_updated);
+CREATE INDEX IF NOT EXISTS ix___db_prefix___task_timeout ON __db_prefix___task (timeout);
+
+-- Add ix_*_task_status_time_scheduled index for waiting tasks
+
+CREATE INDEX ix___db_prefix___task_status_time_scheduled ON __db_prefix___task (status, time_scheduled) WHERE status = 96;
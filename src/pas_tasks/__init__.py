@@ -33,6 +33,8 @@ https://www.direct-netware.de/redirect?licenses;gpl
 from .abstract import Abstract
 from .abstract_persistent import AbstractPersistent
 from .abstract_persistent_proxy import AbstractPersistentProxy
+from .async_persistent_proxy import AsyncPersistentProxy
 from .memory import Memory
 from .persistent import Persistent
 from .persistent_proxy import PersistentProxy
+from .worker_pool import WorkerPool
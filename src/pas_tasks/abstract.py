@@ -36,9 +36,9 @@ from dpt_runtime.not_implemented_exception import NotImplementedException
 from dpt_runtime.supports_mixin import SupportsMixin
 from dpt_runtime.value_exception import ValueException
 from dpt_settings import Settings
-from dpt_threading.thread import Thread
 
 from .tasks import AbstractHook
+from .worker_pool import WorkerPool
 
 class Abstract(SupportsMixin):
     """
@@ -95,6 +95,23 @@ Add a new task with the given TID to the storage for later activation.
         raise NotImplementedException()
     #
 
+    def add_many(self, tasks):
+        """
+Add the given tasks to the storage for later activation. Each task is
+defined by a dict with the keys "tid", "hook" and optionally "timeout" and
+"kwargs".
+
+:param tasks: List of task definitions
+
+:since: v1.0.0
+        """
+
+        for task in tasks:
+            tid, hook, timeout, kwargs = self._get_many_task_arguments(task)
+            self.add(tid, hook, timeout, **kwargs)
+        #
+    #
+
     def call(self, params, last_return = None):
         """
 Called to initiate a task if its known and valid. A task is only executed
@@ -131,6 +148,22 @@ if "last_return" is None.
         return _return
     #
 
+    def _defer_tasks(self, tasks_data, delay):
+        """
+Adds the given tasks again to be started after the given delay. This is
+used if the worker pool returned them because its queue is full.
+
+:param tasks_data: List of task definitions
+:param delay: Delay in seconds
+
+:since: v1.0.0
+        """
+
+        for task_data in tasks_data: self.add(task_data['tid'], task_data['hook'], delay, **task_data['params'])
+
+        if (self._log_handler is not None): self._log_handler.warning("{0!r} deferred {1:d} tasks by {2} seconds", self, len(tasks_data), delay, context = "pas_tasks")
+    #
+
     def get(self, tid):
         """
 Returns the task for the given TID.
@@ -144,6 +177,21 @@ Returns the task for the given TID.
         raise NotImplementedException()
     #
 
+    def _get_many_task_arguments(self, task):
+        """
+Returns the arguments of the given task definition used for "add_many()"
+and "register_timeout_many()".
+
+:param task: Task definition
+
+:return: (tuple) TID, hook, timeout and a copy of the keyword arguments
+:since:  v1.0.0
+        """
+
+        if ("tid" not in task or "hook" not in task): raise ValueException("Given task is unsupported")
+        return ( task['tid'], task['hook'], task.get("timeout"), dict(task.get("kwargs", { })) )
+    #
+
     def is_registered(self, tid, hook = None):
         """
 Checks if a given task ID is known.
@@ -172,6 +220,23 @@ Registers a new task with the given TID to the storage for later use.
         raise NotImplementedException()
     #
 
+    def register_timeout_many(self, tasks):
+        """
+Registers the given tasks to the storage for later use. Each task is
+defined by a dict with the keys "tid", "hook" and optionally "timeout" and
+"kwargs".
+
+:param tasks: List of task definitions
+
+:since: v1.0.0
+        """
+
+        for task in tasks:
+            tid, hook, timeout, kwargs = self._get_many_task_arguments(task)
+            self.register_timeout(tid, hook, timeout, **kwargs)
+        #
+    #
+
     def remove(self, tid):
         """
 Removes the given TID from the storage.
@@ -196,6 +261,25 @@ Updates the task with the given TID to push its expiration time.
         raise NotImplementedException()
     #
 
+    def reregister_timeout_many(self, tids):
+        """
+Updates the tasks with the given TIDs to push their expiration time.
+
+:param tids: List of task IDs
+
+:return: (int) Number of tasks updated
+:since:  v1.0.0
+        """
+
+        _return = 0
+
+        for tid in tids:
+            if (self.reregister_timeout(tid)): _return += 1
+        #
+
+        return _return
+    #
+
     def _run_task(self, task_data):
         """
 Executes a task synchronously.
@@ -227,11 +311,42 @@ Calls a task asynchronously.
 
         if ("hook" not in task_data or "params" not in task_data): raise ValueException("Given task is unsupported")
 
-        if (isinstance(task_data['hook'], AbstractHook)): task_data['hook'].start(self, **task_data['params'])
-        else:
-            thread = Thread(target = self._run_task, args = ( task_data, ))
-            thread.start()
+        worker_pool = WorkerPool.get_instance()
+
+        if (isinstance(task_data['hook'], AbstractHook)): is_started = task_data['hook'].start(self, **task_data['params'])
+        else: is_started = worker_pool.submit(self._run_task, ( task_data, ))
+
+        if (not is_started): self._defer_tasks([ task_data ], worker_pool.rejection_delay)
+    #
+
+    def _start_tasks(self, tasks_data):
+        """
+Calls the given tasks asynchronously. Tasks not using an "AbstractHook"
+instance are handed to the worker pool as one batch. Tasks returned by the
+worker pool are deferred.
+
+:param tasks_data: List of task definitions
+
+:since: v1.0.0
+        """
+
+        batch = [ ]
+        deferred_tasks_data = [ ]
+        worker_pool = WorkerPool.get_instance()
+
+        for task_data in tasks_data:
+            if ("hook" not in task_data or "params" not in task_data): raise ValueException("Given task is unsupported")
+
+            if (not isinstance(task_data['hook'], AbstractHook)): batch.append(( task_data, ))
+            elif (not task_data['hook'].start(self, **task_data['params'])): deferred_tasks_data.append(task_data)
         #
+
+        if (len(batch) > 0):
+            submitted_count = worker_pool.submit_many(self._run_task, batch)
+            deferred_tasks_data += [ args[0] for args in batch[submitted_count:] ]
+        #
+
+        if (len(deferred_tasks_data) > 0): self._defer_tasks(deferred_tasks_data, worker_pool.rejection_delay)
     #
 
     def unregister_timeout(self, tid):
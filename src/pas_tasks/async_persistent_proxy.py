@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;tasks
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasTasksVersion)#
+#echo(__FILEPATH__)#
+"""
+
+from asyncio import get_running_loop
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from weakref import ref
+
+from dpt_settings import Settings
+from dpt_threading.instance_lock import InstanceLock
+
+from .persistent_proxy import PersistentProxy
+
+class AsyncPersistentProxy(object):
+    """
+The asynchronous task proxy provides awaitable methods to forward tasks to
+the background daemon. Requests are executed concurrently on the pooled bus
+connections of "PersistentProxy".
+
+:author:     direct Netware Group et al.
+:copyright:  direct Netware Group - All rights reserved
+:package:    pas
+:subpackage: tasks
+:since:      v1.0.0
+:license:    https://www.direct-netware.de/redirect?licenses;gpl
+             GNU General Public License 2 or later
+    """
+
+    __slots__ = [ "__weakref__", "_executor", "proxy" ]
+    """
+python.org: __slots__ reserves space for the declared variables and prevents
+the automatic creation of __dict__ and __weakref__ for each instance.
+    """
+    _lock = InstanceLock()
+    """
+Thread safety lock
+    """
+    _weakref_instance = None
+    """
+AsyncPersistentProxy weakref instance
+    """
+
+    def __init__(self, proxy = None):
+        """
+Constructor __init__(AsyncPersistentProxy)
+
+:param proxy: PersistentProxy instance; None to use the singleton. The
+              instance is owned by this one and referenced as long as it
+              exists.
+
+:since: v1.0.0
+        """
+
+        self._executor = ThreadPoolExecutor(max_workers = int(Settings.get("pas_tasks_proxy_pool_size", 4)))
+        """
+Executor running blocking bus requests
+        """
+        self.proxy = (PersistentProxy.get_instance() if (proxy is None) else proxy)
+        """
+Underlying PersistentProxy instance owned by this one. The strong reference
+keeps the weakref singleton alive as long as this instance exists.
+        """
+    #
+
+    def __del__(self):
+        """
+Destructor __del__(AsyncPersistentProxy)
+
+:since: v1.0.0
+        """
+
+        self._executor.shutdown(False)
+    #
+
+    async def add(self, tid, hook, timeout = None, **kwargs):
+        """
+Add a new task with the given TID to the storage for later activation.
+
+:param tid: Task ID
+:param hook: Task hook to be called
+:param timeout: Timeout in seconds; None to use global task timeout
+
+:since: v1.0.0
+        """
+
+        await self._execute(self.proxy.add, tid, hook, timeout, **kwargs)
+    #
+
+    async def add_many(self, tasks):
+        """
+Add the given tasks to the storage for later activation.
+
+:param tasks: List of task definitions
+
+:since: v1.0.0
+        """
+
+        await self._execute(self.proxy.add_many, tasks)
+    #
+
+    async def call(self, params = None, last_return = None):
+        """
+Called to initiate a task if its known and valid.
+
+:param params: Parameter specified
+:param last_return: The return value from the last hook called.
+
+:return: (mixed) Task result; None if not matched
+:since:  v1.0.0
+        """
+
+        return await self._execute(self.proxy.call, params, last_return)
+    #
+
+    def _execute(self, method, *args, **kwargs):
+        """
+Executes the given blocking proxy method in the executor of the running
+event loop. It must be called from within a coroutine.
+
+:param method: Proxy method to be called
+
+:return: (object) Awaitable future of the result
+:since:  v1.0.0
+        """
+
+        return get_running_loop().run_in_executor(self._executor, partial(method, *args, **kwargs))
+    #
+
+    async def get(self, tid):
+        """
+Returns the task for the given TID.
+
+:param tid: Task ID
+
+:return: (dict) Task definition
+:since:  v1.0.0
+        """
+
+        return await self._execute(self.proxy.get, tid)
+    #
+
+    async def is_registered(self, tid, hook = None):
+        """
+Checks if a given task ID is known.
+
+:param tid: Task ID
+:param hook: Task hook to be called
+
+:return: (bool) True if defined
+:since:  v1.0.0
+        """
+
+        return await self._execute(self.proxy.is_registered, tid, hook)
+    #
+
+    async def register_timeout(self, tid, hook, timeout = None, **kwargs):
+        """
+Registers a new task with the given TID to the storage for later use.
+
+:param tid: Task ID
+:param hook: Task hook to be called
+:param timeout: Timeout in seconds; None to use global task timeout
+
+:since: v1.0.0
+        """
+
+        await self._execute(self.proxy.register_timeout, tid, hook, timeout, **kwargs)
+    #
+
+    async def register_timeout_many(self, tasks):
+        """
+Registers the given tasks to the storage for later use.
+
+:param tasks: List of task definitions
+
+:since: v1.0.0
+        """
+
+        await self._execute(self.proxy.register_timeout_many, tasks)
+    #
+
+    async def remove(self, tid):
+        """
+Removes the given TID from the storage.
+
+:param tid: Task ID
+
+:return: (bool) True on success
+:since:  v1.0.0
+        """
+
+        return await self._execute(self.proxy.remove, tid)
+    #
+
+    async def reregister_timeout(self, tid):
+        """
+Updates the task with the given TID to push its expiration time.
+
+:return: (bool) True on success
+:since:  v1.0.0
+        """
+
+        return await self._execute(self.proxy.reregister_timeout, tid)
+    #
+
+    async def reregister_timeout_many(self, tids):
+        """
+Updates the tasks with the given TIDs to push their expiration time.
+
+:param tids: List of task IDs
+
+:return: (int) Number of tasks updated
+:since:  v1.0.0
+        """
+
+        return await self._execute(self.proxy.reregister_timeout_many, tids)
+    #
+
+    async def unregister_timeout(self, tid):
+        """
+Removes the given TID from the storage.
+
+:return: (bool) True on success
+:since:  v1.0.0
+        """
+
+        return await self._execute(self.proxy.unregister_timeout, tid)
+    #
+
+    @staticmethod
+    def get_instance():
+        """
+Get the AsyncPersistentProxy singleton.
+
+:return: (AsyncPersistentProxy) Object on success
+:since:  v1.0.0
+        """
+
+        _return = None
+
+        with AsyncPersistentProxy._lock:
+            if (AsyncPersistentProxy._weakref_instance is not None): _return = AsyncPersistentProxy._weakref_instance()
+
+            if (_return is None):
+                _return = AsyncPersistentProxy()
+                AsyncPersistentProxy._weakref_instance = ref(_return)
+            #
+        #
+
+        return _return
+    #
+#
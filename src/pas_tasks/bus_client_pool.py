@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;tasks
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasTasksVersion)#
+#echo(__FILEPATH__)#
+"""
+
+from threading import Condition, local
+
+from dpt_runtime.value_exception import ValueException
+from dpt_settings import Settings
+from pas_bus import Client as BusClient
+
+class BusClientPool(object):
+    """
+A "BusClientPool" keeps a bounded number of bus connections. Each thread
+checks out its own connection for the duration of a request so that
+concurrent callers do not serialize on one socket.
+
+:author:     direct Netware Group et al.
+:copyright:  direct Netware Group - All rights reserved
+:package:    pas
+:subpackage: tasks
+:since:      v1.0.0
+:license:    https://www.direct-netware.de/redirect?licenses;gpl
+             GNU General Public License 2 or later
+    """
+
+    # pylint: disable=broad-except
+
+    __slots__ = [ "_clients",
+                  "_clients_count",
+                  "_condition",
+                  "name",
+                  "size",
+                  "_thread_local"
+                ]
+    """
+python.org: __slots__ reserves space for the declared variables and prevents
+the automatic creation of __dict__ and __weakref__ for each instance.
+    """
+
+    def __init__(self, name = "pas_tasks_daemon", size = None):
+        """
+Constructor __init__(BusClientPool)
+
+:param name: Bus name to connect to
+:param size: Maximum number of connections; None to use the configured value
+
+:since: v1.0.0
+        """
+
+        if (size is None): size = int(Settings.get("pas_tasks_proxy_pool_size", 4))
+        if (size < 1): raise ValueException("Bus client pool size given is invalid")
+
+        self._clients = [ ]
+        """
+Connected bus clients not checked out
+        """
+        self._clients_count = 0
+        """
+Number of connected bus clients
+        """
+        self._condition = Condition()
+        """
+Condition used to notify threads waiting for a bus client
+        """
+        self.name = name
+        """
+Bus name to connect to
+        """
+        self.size = size
+        """
+Maximum number of connections
+        """
+        self._thread_local = local()
+        """
+Thread-local bus client checked out by the current thread
+        """
+    #
+
+    def _checkin(self, client, is_valid = True):
+        """
+Returns a checked out bus client to the pool.
+
+:param client: Bus client
+:param is_valid: False to disconnect and discard the bus client
+
+:since: v1.0.0
+        """
+
+        if (not is_valid):
+            try: client.disconnect()
+            except Exception: pass
+        #
+
+        with self._condition:
+            if (is_valid): self._clients.append(client)
+            else: self._clients_count -= 1
+
+            self._condition.notify()
+        #
+    #
+
+    def _checkout(self):
+        """
+Checks out a bus client. Blocks until one is available if all allowed
+connections are in use.
+
+:return: (object) Bus client
+:since:  v1.0.0
+        """
+
+        _return = None
+
+        with self._condition:
+            while (len(self._clients) < 1 and self._clients_count >= self.size): self._condition.wait()
+
+            if (len(self._clients) > 0): _return = self._clients.pop()
+            else: self._clients_count += 1
+        #
+
+        if (_return is None):
+            try: _return = BusClient(self.name)
+            except Exception:
+                with self._condition:
+                    self._clients_count -= 1
+                    self._condition.notify()
+                #
+
+                raise
+            #
+        #
+
+        return _return
+    #
+
+    def disconnect(self):
+        """
+Closes all bus connections not checked out.
+
+:since: v1.0.0
+        """
+
+        with self._condition:
+            clients = self._clients
+            self._clients = [ ]
+            self._clients_count -= len(clients)
+        #
+
+        for client in clients:
+            try: client.disconnect()
+            except Exception: pass
+        #
+    #
+
+    def request(self, *args, **kwargs):
+        """
+Requests the bus hook given as the first positional argument with a bus
+client checked out for the current thread. Nested requests of the same
+thread reuse its bus client.
+
+:return: (mixed) Result data
+:since:  v1.0.0
+        """
+
+        client = getattr(self._thread_local, "client", None)
+
+        if (client is not None): _return = client.request(*args, **kwargs)
+        else:
+            client = self._checkout()
+            is_valid = False
+            self._thread_local.client = client
+
+            try:
+                _return = client.request(*args, **kwargs)
+                is_valid = True
+            finally:
+                self._thread_local.client = None
+                self._checkin(client, is_valid)
+            #
+        #
+
+        return _return
+    #
+#
@@ -30,16 +30,21 @@ https://www.direct-netware.de/redirect?licenses;gpl
 #echo(__FILEPATH__)#
 """
 
+from os import getpid
+from socket import gethostname
 from time import time
+from uuid import uuid4 as uuid
 from weakref import ref
 
+from dpt_settings import Settings
 from dpt_threading.instance_lock import InstanceLock
-from pas_database import Connection, NothingMatchedException
+from pas_database import NothingMatchedException
 
 from .abstract_persistent import AbstractPersistent
 from .database_task_context import DatabaseTaskContext
 from .instances import Task
 from .tasks import PersistentLrtHook
+from .worker_pool import WorkerPool
 
 class Database(AbstractPersistent):
     """
@@ -54,7 +59,19 @@ A "Database" instance stores tasks in the database.
              GNU General Public License 2 or later
     """
 
-    __slots__ = [ ]
+    __slots__ = [ "claim_limit",
+                  "_lease_renewal_timestamp",
+                  "lease_time",
+                  "maintenance_chunk_size",
+                  "maintenance_interval",
+                  "_maintenance_statistics",
+                  "_maintenance_timestamp",
+                  "_next_timestamp",
+                  "next_timestamp_cache_time",
+                  "_next_timestamp_expiry",
+                  "_next_timestamp_generation",
+                  "worker_id"
+                ]
     """
 python.org: __slots__ reserves space for the declared variables and prevents
 the automatic creation of __dict__ and __weakref__ for each instance.
@@ -68,6 +85,76 @@ Thread safety lock
 Tasks weakref instance
     """
 
+    def __init__(self):
+        """
+Constructor __init__(Database)
+
+:since: v1.0.0
+        """
+
+        AbstractPersistent.__init__(self)
+
+        self.claim_limit = int(Settings.get("pas_tasks_database_claim_limit", 10))
+        """
+Maximum number of due tasks claimed per "run()" call
+        """
+        self._lease_renewal_timestamp = -1
+        """
+UNIX timestamp of the next lease renewal
+        """
+        self.lease_time = int(Settings.get("pas_tasks_database_lease_time", 300))
+        """
+Time in seconds a claimed task is owned by this daemon without renewal
+        """
+        self.maintenance_chunk_size = int(Settings.get("pas_tasks_database_maintenance_chunk_size", 1000))
+        """
+Maximum number of archived tasks deleted per statement
+        """
+        self.maintenance_interval = int(Settings.get("pas_tasks_database_maintenance_interval", 3600))
+        """
+Time in seconds between maintenance runs; 0 to disable them
+        """
+        self._maintenance_statistics = { "rows_removed": 0,
+                                         "rows_removed_last": 0,
+                                         "runs": 0,
+                                         "time_last": 0,
+                                         "timestamp_last": -1
+                                       }
+        """
+Counters of maintenance runs
+        """
+        self._maintenance_timestamp = -1
+        """
+UNIX timestamp of the next maintenance run
+        """
+        self._next_timestamp = None
+        """
+Cached UNIX timestamp of the waiting task to be executed next; None if
+invalid
+        """
+        self.next_timestamp_cache_time = int(Settings.get("pas_tasks_database_next_timestamp_cache_time", 60))
+        """
+Time in seconds the cached next UNIX timestamp is used to pick up tasks
+added by other daemons
+        """
+        self._next_timestamp_expiry = -1
+        """
+UNIX timestamp the cached next UNIX timestamp expires
+        """
+        self._next_timestamp_generation = 0
+        """
+Counter incremented whenever the cached next UNIX timestamp is changed or
+invalidated
+        """
+        self.worker_id = Settings.get("pas_tasks_database_worker_id")
+        """
+Worker ID identifying this daemon as the owner of claimed tasks
+        """
+
+        if (self.worker_id is None): self.worker_id = "{0}:{1:d}:{2}".format(gethostname(), getpid(), uuid().hex[:8])
+        self.worker_id = self.worker_id[-100:]
+    #
+
     @property
     def _next_update_timestamp(self):
         """
@@ -78,18 +165,27 @@ Get the implementation specific next "run()" UNIX timestamp.
 :since:  v1.0.0
         """
 
-        _return = -1
+        _return = self._get_next_timestamp()
 
-        with Connection.get_instance():
-            try:
-                task = Task.load_next()
-                _return = task.time_scheduled
-            except NothingMatchedException: pass
+        for timestamp in ( self._lease_renewal_timestamp, self._maintenance_timestamp ):
+            if (timestamp > -1 and (_return < 0 or timestamp < _return)): _return = timestamp
         #
 
         return _return
     #
 
+    @property
+    def maintenance_statistics(self):
+        """
+Returns the counters of maintenance runs.
+
+:return: (dict) Maintenance counters
+:since:  v1.0.0
+        """
+
+        with self._lock: return self._maintenance_statistics.copy()
+    #
+
     def add(self, tid, hook, timeout = None, **kwargs):
         """
 Add a new task with the given TID to the storage for later activation.
@@ -109,6 +205,31 @@ Add a new task with the given TID to the storage for later activation.
         if (self._log_handler is not None): self._log_handler.debug("{0!r} registered TID '{1}' with target {2!r} and timeout '{3}'", self, tid, hook, timeout, context = "pas_tasks")
     #
 
+    def add_many(self, tasks):
+        """
+Add the given tasks to the storage for later activation. Each task is
+defined by a dict with the keys "tid", "hook" and optionally "timeout" and
+"kwargs".
+
+:param tasks: List of task definitions
+
+:since: v1.0.0
+        """
+
+        tasks_data = [ ]
+        timestamp = time()
+
+        for task in tasks:
+            tid, hook, timeout, params = self._get_many_task_arguments(task)
+            if (timeout is None): timeout = self.task_timeout
+
+            tasks_data.append({ "tid": tid, "hook": hook, "params": params, "time_scheduled": int(timestamp + timeout) })
+        #
+
+        self._insert_many(tasks_data)
+        if (self._log_handler is not None): self._log_handler.debug("{0!r} registered {1:d} tasks", self, len(tasks_data), context = "pas_tasks")
+    #
+
     def call(self, params, last_return = None):
         """
 Called to initiate a task if its known and valid. A task is only executed
@@ -124,15 +245,51 @@ if "last_return" is None.
         _return = last_return
 
         if (_return is None and "tid" in params):
-            task = self.get(params['tid'])
-            task_status = (Task.STATUS_UNKNOWN if (task is None) else task['_task'].status)
+            task = Task.load_tid(params['tid'])
 
-            if (task_status == Task.STATUS_WAITING): _return = AbstractPersistent.call(self, params)
+            if (task.status == Task.STATUS_WAITING):
+                # Client and timeout interval are read from their columns without decoding the task parameter
+                client = task.client
+                is_valid = (client is None or params.get("client") == client)
+
+                if (is_valid):
+                    if (task.timeout_interval is not None): self.reregister_timeout(params['tid'])
+                    _return = self._run_task(self._get_task_data(params['tid'], task))
+                #
+            #
         #
 
         return _return
     #
 
+    def _defer_tasks(self, tasks_data, delay):
+        """
+Moves the given claimed tasks back to the "waiting" status to be started
+after the given delay.
+
+:param tasks_data: List of task definitions
+:param delay: Delay in seconds
+
+:since: v1.0.0
+        """
+
+        deferred_count = 0
+        time_scheduled = int(time() + delay)
+
+        for task_data in tasks_data:
+            if (task_data['_task'].transition_status(Task.STATUS_WAITING,
+                                                     Task.STATUS_QUEUED,
+                                                     time_scheduled = time_scheduled,
+                                                     owner = "",
+                                                     lease_expiry = 0
+                                                    )
+               ): deferred_count += 1
+        #
+
+        if (deferred_count > 0): self._update_next_timestamp(time_scheduled)
+        if (self._log_handler is not None): self._log_handler.warning("{0!r} deferred {1:d} tasks by {2} seconds", self, deferred_count, delay, context = "pas_tasks")
+    #
+
     def get(self, tid):
         """
 Returns the task for the given TID.
@@ -143,7 +300,53 @@ Returns the task for the given TID.
 :since:  v1.0.0
         """
 
-        task = Task.load_tid(tid)
+        return self._get_task_data(tid, Task.load_tid(tid))
+    #
+
+    def _get_next_timestamp(self):
+        """
+Returns the UNIX timestamp of the waiting task to be executed next. The
+database is queried without holding the timer lock if the cached one is
+invalid or expired.
+
+:return: (int) UNIX timestamp; -1 if no task is waiting
+:since:  v1.0.0
+        """
+
+        with self._lock:
+            _return = self._next_timestamp
+            generation = self._next_timestamp_generation
+
+            is_expired = (_return is None or self._next_timestamp_expiry < time())
+        #
+
+        if (is_expired):
+            _return = Task.get_next_time_scheduled()
+
+            with self._lock:
+                if (generation == self._next_timestamp_generation):
+                    self._next_timestamp = _return
+                    self._next_timestamp_expiry = time() + self.next_timestamp_cache_time
+                elif (self._next_timestamp is not None
+                      and -1 < self._next_timestamp
+                      and (_return < 0 or self._next_timestamp < _return)
+                     ): _return = self._next_timestamp
+            #
+        #
+
+        return _return
+    #
+
+    def _get_task_data(self, tid, task):
+        """
+Returns the task definition of the given database task.
+
+:param tid: Task ID
+:param task: Database task
+
+:return: (dict) Task definition
+:since:  v1.0.0
+        """
 
         _return = { "hook": task.hook,
                     "params": task.params,
@@ -151,7 +354,30 @@ Returns the task for the given TID.
                     "_task": task
                   }
 
-        if ("_timeout" in _return['params']): _return['_timeout'] = _return['params']['_timeout']
+        timeout_interval = task.timeout_interval
+        if (timeout_interval is not None): _return['_timeout'] = timeout_interval
+
+        return _return
+    #
+
+    def _get_insert_hook(self, hook, params):
+        """
+Returns the hook name to be saved for the given hook. Parameters of a
+"PersistentLrtHook" are merged into the given ones.
+
+:param hook: Task hook to be called
+:param params: Parameter specified
+
+:return: (str) Hook name
+:since:  v1.0.0
+        """
+
+        if (isinstance(hook, PersistentLrtHook)):
+            _return = hook.underlying_hook
+
+            params.update(hook.params)
+            params['_lrt_hook'] = True
+        else: _return = hook
 
         return _return
     #
@@ -170,14 +396,7 @@ Add a new task with the given TID to the storage for later activation.
             task = Task()
             task.tid = tid
             task.name = tid
-
-            if (isinstance(hook, PersistentLrtHook)):
-                task.hook = hook.underlying_hook
-
-                params.update(hook.params)
-                params['_lrt_hook'] = True
-            else: task.hook = hook
-
+            task.hook = self._get_insert_hook(hook, params)
             task.params = params
 
             if (time_scheduled is not None):
@@ -189,7 +408,48 @@ Add a new task with the given TID to the storage for later activation.
 
             task.save()
 
-            if (time_scheduled is not None): self.update_timestamp(time_scheduled)
+            if (time_scheduled is not None): self._update_next_timestamp(time_scheduled)
+        #
+    #
+
+    def _insert_many(self, tasks_data):
+        """
+Add the given tasks to the storage with one multi-row INSERT statement.
+
+:param tasks_data: List of dicts with the keys "tid", "hook", "params" and
+                   optionally "time_scheduled" and "timeout"
+
+:since: v1.0.0
+        """
+
+        if (self.is_started and len(tasks_data) > 0):
+            time_scheduled = -1
+
+            for task_data in tasks_data:
+                task_data['hook'] = self._get_insert_hook(task_data['hook'], task_data['params'])
+
+                if ("time_scheduled" in task_data
+                    and (time_scheduled < 0 or task_data['time_scheduled'] < time_scheduled)
+                   ): time_scheduled = task_data['time_scheduled']
+            #
+
+            Task.insert_many(tasks_data)
+
+            if (time_scheduled > -1): self._update_next_timestamp(time_scheduled)
+        #
+    #
+
+    def _invalidate_next_timestamp(self):
+        """
+Invalidates the cached UNIX timestamp of the waiting task to be executed
+next.
+
+:since: v1.0.0
+        """
+
+        with self._lock:
+            self._next_timestamp = None
+            self._next_timestamp_generation += 1
         #
     #
 
@@ -233,6 +493,32 @@ Registers a new task with the given TID to the storage for later use.
         if (self._log_handler is not None): self._log_handler.debug("{0!r} registered TID '{1}' with target {2!r}", self, tid, hook, context = "pas_tasks")
     #
 
+    def register_timeout_many(self, tasks):
+        """
+Registers the given tasks to the storage for later use. Each task is
+defined by a dict with the keys "tid", "hook" and optionally "timeout" and
+"kwargs".
+
+:param tasks: List of task definitions
+
+:since: v1.0.0
+        """
+
+        tasks_data = [ ]
+        timestamp = time()
+
+        for task in tasks:
+            tid, hook, timeout, params = self._get_many_task_arguments(task)
+            if (timeout is None): timeout = self.task_timeout
+
+            params['_timeout'] = timeout
+            tasks_data.append({ "tid": tid, "hook": hook, "params": params, "timeout": int(timestamp + timeout) })
+        #
+
+        self._insert_many(tasks_data)
+        if (self._log_handler is not None): self._log_handler.debug("{0!r} registered {1:d} tasks with timeout", self, len(tasks_data), context = "pas_tasks")
+    #
+
     def remove(self, tid):
         """
 Removes the given TID from the storage.
@@ -247,7 +533,9 @@ Removes the given TID from the storage.
 
         _return = False
 
-        try: Task.load_tid(tid).delete()
+        try:
+            _return = Task.load_tid(tid).delete()
+            self._invalidate_next_timestamp()
         except NothingMatchedException: pass
 
         if (_return and self._log_handler is not None): self._log_handler.debug("{0!r} removed TID '{1}'", self, tid, context = "pas_tasks")
@@ -262,52 +550,97 @@ Updates the task with the given TID to push its expiration time.
 :since:  v1.0.0
         """
 
-        _return = False
+        return Task.touch_tid(tid)
+    #
 
-        try:
-            task = Task.load_tid(tid)
-            params = task.params
+    def run(self):
+        """
+Timed task execution
+
+:since: v1.0.0
+        """
 
-            if ("_timeout" in params):
-                task.timeout = (time() + params['_timeout'])
-                task.save()
+        tasks = [ ]
 
-                _return = True
+        if (self.is_started):
+            if (self._lease_renewal_timestamp <= time()): self._renew_leases()
+
+            if (self._maintenance_timestamp > -1 and self._maintenance_timestamp <= time()):
+                self._maintenance_timestamp = time() + self.maintenance_interval
+                WorkerPool.get_instance().submit(self._run_maintenance)
             #
-        except NothingMatchedException: pass
+            tasks = Task.claim_next(self.claim_limit, self.worker_id, self.lease_time)
+
+            if (len(tasks) > 0): self._invalidate_next_timestamp()
+            else:
+                with self._lock:
+                    if (self._next_timestamp is not None and -1 < self._next_timestamp <= time()):
+                        self._next_timestamp = None
+                        self._next_timestamp_generation += 1
+                    #
+                #
+            #
+        #
 
-        return _return
+        # Refresh an expired next UNIX timestamp before the timer lock is acquired
+        if (self.is_started): self._get_next_timestamp()
+
+        with self._lock: AbstractPersistent.run(self)
+
+        tasks_data = [ { "hook": task.hook,
+                         "params": task.params,
+                         "_task": task
+                       }
+                       for task in tasks
+                     ]
+
+        if (len(tasks_data) > 0): self._start_tasks(tasks_data)
     #
 
-    def run(self):
+    def _renew_leases(self):
         """
-Timed task execution
+Renews the leases of tasks owned by this daemon and resets tasks of other
+daemons with expired leases.
 
 :since: v1.0.0
         """
 
-        with self._lock:
-            task = None
-            task_data = None
+        self._lease_renewal_timestamp = time() + (self.lease_time / 3)
 
-            if (self.is_started):
-                try: task = Task.load_next()
-                except NothingMatchedException: pass
-            #
+        renewed_count = Task.renew_leases(self.worker_id, self.lease_time)
+        reset_count = Task._reset_stale_running()
 
-            if (task is not None):
-                task.status = Task.STATUS_QUEUED
-                task.save()
+        if (self._log_handler is not None and (renewed_count > 0 or reset_count > 0)):
+            self._log_handler.debug("{0!r} renewed {1:d} and reset {2:d} stale task leases", self, renewed_count, reset_count, context = "pas_tasks")
+        #
+    #
 
-                task_data = { "hook": task.hook,
-                              "params": task.params,
-                              "_task": task
-                            }
-            #
+    def _run_maintenance(self):
+        """
+Deletes archived tasks in chunks of the configured size.
+
+:since: v1.0.0
+        """
 
-            AbstractPersistent.run(self)
-            if (task_data is not None): self._start_task(task_data)
+        rows_removed = 0
+        timestamp = time()
+
+        while (True):
+            chunk_rows_removed = Task.delete_archived(self.maintenance_chunk_size)
+            rows_removed += chunk_rows_removed
+
+            if (chunk_rows_removed < self.maintenance_chunk_size): break
+        #
+
+        with self._lock:
+            self._maintenance_statistics['rows_removed'] += rows_removed
+            self._maintenance_statistics['rows_removed_last'] = rows_removed
+            self._maintenance_statistics['runs'] += 1
+            self._maintenance_statistics['time_last'] = time() - timestamp
+            self._maintenance_statistics['timestamp_last'] = timestamp
         #
+
+        if (self._log_handler is not None): self._log_handler.info("{0!r} removed {1:d} archived tasks", self, rows_removed, context = "pas_tasks")
     #
 
     def _run_task(self, task_data):
@@ -323,7 +656,9 @@ Executes a task synchronously.
         _return = None
 
         if (isinstance(task_data.get("_task"), Task)):
-            with DatabaseTaskContext(task_data['_task']): _return = AbstractPersistent._run_task(self, task_data)
+            with DatabaseTaskContext(task_data['_task'], self.worker_id, self.lease_time) as is_running:
+                if (is_running): _return = AbstractPersistent._run_task(self, task_data)
+            #
         else: _return = AbstractPersistent._run_task(self, task_data)
 
         return _return
@@ -339,7 +674,13 @@ Starts the database tasks scheduler.
 :since: v1.0.0
         """
 
-        Task._reset_stale_running()
+        Task._reset_stale_running(self.worker_id)
+        self._lease_renewal_timestamp = time() + (self.lease_time / 3)
+
+        if (self.maintenance_interval > 0 and (not Settings.get("pas_database_auto_maintenance", False))):
+            self._maintenance_timestamp = time() + self.maintenance_interval
+        #
+
         AbstractPersistent.start(self, params, last_return)
     #
 
@@ -358,12 +699,50 @@ Removes the given TID from the storage.
         try:
             task = Task.load_tid(tid)
             _return = task.delete()
+
+            self._invalidate_next_timestamp()
         except NothingMatchedException: pass
 
         if (_return and self._log_handler is not None): self._log_handler.debug("{0!r} removed TID '{1}'", self, tid, context = "pas_tasks")
         return _return
     #
 
+    def update_timestamp(self, timestamp = None):
+        """
+Update the timestamp for the next "run()" call. The next UNIX timestamp is
+queried before the timer lock is acquired if none is given.
+
+:param timestamp: UNIX timestamp; None to use the next implementation
+                  specific one
+
+:since: v1.0.0
+        """
+
+        if (timestamp is None and self.is_started): timestamp = self._next_update_timestamp
+        AbstractPersistent.update_timestamp(self, timestamp)
+    #
+
+    def _update_next_timestamp(self, timestamp):
+        """
+Lowers the cached UNIX timestamp of the waiting task to be executed next if
+the given one is earlier and updates the timer accordingly.
+
+:param timestamp: UNIX timestamp of an inserted task
+
+:since: v1.0.0
+        """
+
+        with self._lock:
+            if (self._next_timestamp is not None
+                and (self._next_timestamp < 0 or timestamp < self._next_timestamp)
+               ): self._next_timestamp = timestamp
+
+            self._next_timestamp_generation += 1
+        #
+
+        self.update_timestamp(timestamp)
+    #
+
     @staticmethod
     def get_instance():
         """
@@ -30,8 +30,10 @@ https://www.direct-netware.de/redirect?licenses;gpl
 #echo(__FILEPATH__)#
 """
 
+from time import time
 from traceback import format_exception
 
+from dpt_module_loader import NamedClassLoader
 from dpt_runtime.value_exception import ValueException
 
 from .instances import Task
@@ -49,23 +51,51 @@ A "Database" instance stores tasks in the database.
              GNU General Public License 2 or later
     """
 
-    __slots__ = [ "task" ]
+    __slots__ = [ "is_running", "lease_time", "_log_handler", "owner", "task" ]
     """
 python.org: __slots__ reserves space for the declared variables and prevents
 the automatic creation of __dict__ and __weakref__ for each instance.
     """
 
-    def __init__(self, task):
+    def __init__(self, task, owner = None, lease_time = None):
         """
 Constructor __init__(DatabaseTaskContext)
 
 :param task: Database task
+:param owner: Worker ID of the executing daemon; None to use the one of the
+              "Database" instance
+:param lease_time: Lease time in seconds; None to use the one of the
+                   "Database" instance
 
 :since: v1.0.0
         """
 
         if (not isinstance(task, Task)): raise ValueException("Task '{0!r}' given is not a database one".format(task))
 
+        if (owner is None or lease_time is None):
+            database_tasks = NamedClassLoader.get_singleton("pas_tasks.Database")
+
+            if (owner is None): owner = database_tasks.worker_id
+            if (lease_time is None): lease_time = database_tasks.lease_time
+        #
+
+        self.is_running = False
+        """
+True if the task status has been changed to "running" by this context
+        """
+        self.lease_time = lease_time
+        """
+Lease time in seconds
+        """
+        self._log_handler = NamedClassLoader.get_singleton("dpt_logging.LogHandler", False)
+        """
+The LogHandler is called whenever debug messages should be logged or errors
+happened.
+        """
+        self.owner = owner
+        """
+Worker ID of the executing daemon
+        """
         self.task = task
         """
 Database task
@@ -74,18 +104,25 @@ Database task
 
     def __enter__(self):
         """
-python.org: Enter the runtime context related to this object.
+python.org: Enter the runtime context related to this object. The task must
+only be executed if true is returned. Its status may have been changed
+concurrently by another daemon. The running task is leased to the owner
+to not be reset as being stale.
 
-:since: v1.0.0
+:return: (bool) True if the task status has been changed to "running"
+:since:  v1.0.0
         """
 
-        with self.task:
-            try: self.task.status = Task.STATUS_RUNNING
-            except Exception:
-                self.task.status = Task.STATUS_FAILED
-                raise
-            finally: self.task.save()
+        self.is_running = self.task.transition_status(Task.STATUS_RUNNING,
+                                                      owner = self.owner,
+                                                      lease_expiry = int(time()) + self.lease_time
+                                                     )
+
+        if ((not self.is_running) and self._log_handler is not None):
+            self._log_handler.debug("{0!r} skipped task '{1}' changed concurrently", self, self.task.tid, context = "pas_tasks")
         #
+
+        return self.is_running
     #
 
     def __exit__(self, exc_type, exc_value, traceback):
@@ -96,8 +133,19 @@ python.org: Exit the runtime context related to this object.
 :since:  v1.0.0
         """
 
-        with self.task:
-            if (exc_type is not None or exc_value is not None):
+        if (self.is_running and exc_type is None and exc_value is None):
+            # The status may have been changed by the task itself
+            status = self.task.status
+
+            if (status == Task.STATUS_RUNNING):
+                status = (Task.STATUS_WAITING if (self.task.is_timeout_set) else Task.STATUS_COMPLETED)
+            #
+
+            if ((not self.task.save_status_transition(status, Task.STATUS_RUNNING, owner = "", lease_expiry = 0))
+                and self._log_handler is not None
+               ): self._log_handler.debug("{0!r} could not save task '{1}' changed concurrently", self, self.task.tid, context = "pas_tasks")
+        elif (self.is_running):
+            with self.task:
                 params = self.task.params
 
                 if ("error" not in params):
@@ -108,15 +156,9 @@ python.org: Exit the runtime context related to this object.
                     self.task.params = params
                 #
 
-                self.task.status = Task.STATUS_FAILED
-            elif (self.task.status == Task.STATUS_RUNNING):
-                self.task.status = (Task.STATUS_WAITING
-                                    if (self.task.is_timeout_set) else
-                                    Task.STATUS_COMPLETED
-                                   )
+                self.task.set_data_attributes(status = Task.STATUS_FAILED, owner = "", lease_expiry = 0)
+                self.task.save()
             #
-
-            self.task.save()
         #
 
         return False
@@ -69,6 +69,11 @@ Called for "pas.database.Task.applySchema.after"
         task_class._regenerate_tids()
     #
 
+    if (params.get("current_version") < 5 and params.get("target_version") >= 5):
+        task_class = NamedClassLoader.get_class("pas_tasks.instances.Task")
+        task_class._populate_params_columns()
+    #
+
     return last_return
 #
 
@@ -39,11 +39,22 @@ from dpt_threading.thread_lock import ThreadLock
 
 from ...memory import Memory as MemoryTasks
 from ...persistent import Persistent as PersistentTasks
+from ...persistent_proxy import PersistentProxy
+from ...tasks import LrtExecutor, LrtProcessPool
+from ...worker_pool import WorkerPool
 
 _lock = ThreadLock()
 """
 Thread safety lock
 """
+_lrt_executor_instance = None
+"""
+LrtExecutor instance
+"""
+_lrt_process_pool_instance = None
+"""
+LrtProcessPool instance
+"""
 _memory_tasks_instance = None
 """
 MemoryTasks instance
@@ -52,6 +63,10 @@ _persistent_tasks_instance = None
 """
 PersistentTasks instance
 """
+_worker_pool_instance = None
+"""
+WorkerPool instance
+"""
 
 def add_persistent_task(params, last_return = None):
     """
@@ -80,6 +95,27 @@ Called for "pas.tasks.Persistent.add"
     return _return
 #
 
+def add_persistent_tasks(params, last_return = None):
+    """
+Called for "pas.tasks.Persistent.addMany"
+
+:param params: Parameter specified
+:param last_return: The return value from the last hook called.
+
+:return: (mixed) Return value
+:since:  v1.0.0
+    """
+
+    if (last_return is not None): _return = last_return
+    elif ("tasks" not in params): raise ValueException("Missing required argument")
+    else:
+        PersistentTasks.get_instance().add_many(params['tasks'])
+        _return = True
+    #
+
+    return _return
+#
+
 def call(params, last_return = None):
     """
 Called for "pas.Tasks.call"
@@ -176,7 +212,7 @@ Called for "pas.Application.onShutdown"
     """
 
     # global: _lock
-    global _memory_tasks_instance, _persistent_tasks_instance
+    global _lrt_executor_instance, _lrt_process_pool_instance, _memory_tasks_instance, _persistent_tasks_instance, _worker_pool_instance
 
     with _lock:
         if (_persistent_tasks_instance is not None):
@@ -188,8 +224,25 @@ Called for "pas.Application.onShutdown"
             _memory_tasks_instance.stop()
             _memory_tasks_instance = None
         #
+
+        if (_lrt_executor_instance is not None):
+            _lrt_executor_instance.stop()
+            _lrt_executor_instance = None
+        #
+
+        if (_lrt_process_pool_instance is not None):
+            _lrt_process_pool_instance.stop()
+            _lrt_process_pool_instance = None
+        #
+
+        if (_worker_pool_instance is not None):
+            _worker_pool_instance.stop()
+            _worker_pool_instance = None
+        #
     #
 
+    PersistentProxy.shutdown()
+
     return last_return
 #
 
@@ -204,9 +257,24 @@ Called for "pas.Application.onStartup"
     """
 
     # global: _lock
-    global _memory_tasks_instance, _persistent_tasks_instance
+    global _lrt_executor_instance, _lrt_process_pool_instance, _memory_tasks_instance, _persistent_tasks_instance, _worker_pool_instance
 
     with _lock:
+        if (_worker_pool_instance is None):
+            _worker_pool_instance = WorkerPool.get_instance()
+            _worker_pool_instance.start()
+        #
+
+        if (_lrt_executor_instance is None):
+            _lrt_executor_instance = LrtExecutor.get_instance()
+            _lrt_executor_instance.start()
+        #
+
+        if (_lrt_process_pool_instance is None):
+            _lrt_process_pool_instance = LrtProcessPool.get_instance()
+            _lrt_process_pool_instance.start()
+        #
+
         if (_memory_tasks_instance is None):
             _memory_tasks_instance = MemoryTasks.get_instance()
             _memory_tasks_instance.start()
@@ -248,6 +316,27 @@ Called for "pas.tasks.Persistent.registerTimeout"
     return _return
 #
 
+def register_persistent_timeout_tasks(params, last_return = None):
+    """
+Called for "pas.tasks.Persistent.registerTimeoutMany"
+
+:param params: Parameter specified
+:param last_return: The return value from the last hook called.
+
+:return: (mixed) Return value
+:since:  v1.0.0
+    """
+
+    if (last_return is not None): _return = last_return
+    elif ("tasks" not in params): raise ValueException("Missing required argument")
+    else:
+        PersistentTasks.get_instance().register_timeout_many(params['tasks'])
+        _return = True
+    #
+
+    return _return
+#
+
 def register_plugin():
     """
 Register plugin hooks.
@@ -264,11 +353,14 @@ Register plugin hooks.
     Hook.register("pas.Tasks.call", call)
     Hook.register("pas.tasks.Persistent.isRegistered", is_persistent_task_registered)
     Hook.register("pas.tasks.Persistent.add", add_persistent_task)
+    Hook.register("pas.tasks.Persistent.addMany", add_persistent_tasks)
     Hook.register("pas.tasks.Persistent.call", call_persistent_task)
     Hook.register("pas.tasks.Persistent.get", get_persistent_task)
     Hook.register("pas.tasks.Persistent.registerTimeout", register_persistent_timeout_task)
+    Hook.register("pas.tasks.Persistent.registerTimeoutMany", register_persistent_timeout_tasks)
     Hook.register("pas.tasks.Persistent.remove", remove_persistent_task)
     Hook.register("pas.tasks.Persistent.reregisterTimeout", reregister_persistent_timeout_task)
+    Hook.register("pas.tasks.Persistent.reregisterTimeoutMany", reregister_persistent_timeout_tasks)
     Hook.register("pas.tasks.Persistent.unregisterTimeout", unregister_persistent_timeout_task)
 #
 
@@ -308,6 +400,24 @@ Called for "pas.tasks.Persistent.reregisterTimeout"
     return _return
 #
 
+def reregister_persistent_timeout_tasks(params, last_return = None):
+    """
+Called for "pas.tasks.Persistent.reregisterTimeoutMany"
+
+:param params: Parameter specified
+:param last_return: The return value from the last hook called.
+
+:return: (mixed) Return value
+:since:  v1.0.0
+    """
+
+    if (last_return is not None): _return = last_return
+    elif ("tids" not in params): raise ValueException("Missing required argument")
+    else: _return = PersistentTasks.get_instance().reregister_timeout_many(params['tids'])
+
+    return _return
+#
+
 def unregister_persistent_timeout_task(params, last_return = None):
     """
 Called for "pas.tasks.Persistent.unregisterTimeout"
@@ -338,10 +448,13 @@ Unregister plugin hooks.
     Hook.unregister("pas.Tasks.call", call)
     Hook.unregister("pas.tasks.Persistent.isRegistered", is_persistent_task_registered)
     Hook.unregister("pas.tasks.Persistent.add", add_persistent_task)
+    Hook.unregister("pas.tasks.Persistent.addMany", add_persistent_tasks)
     Hook.unregister("pas.tasks.Persistent.call", call_persistent_task)
     Hook.unregister("pas.tasks.Persistent.get", get_persistent_task)
     Hook.unregister("pas.tasks.Persistent.registerTimeout", register_persistent_timeout_task)
+    Hook.unregister("pas.tasks.Persistent.registerTimeoutMany", register_persistent_timeout_tasks)
     Hook.unregister("pas.tasks.Persistent.remove", remove_persistent_task)
     Hook.unregister("pas.tasks.Persistent.reregisterTimeout", reregister_persistent_timeout_task)
+    Hook.unregister("pas.tasks.Persistent.reregisterTimeoutMany", reregister_persistent_timeout_tasks)
     Hook.unregister("pas.tasks.Persistent.unregisterTimeout", unregister_persistent_timeout_task)
 #
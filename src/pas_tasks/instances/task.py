@@ -30,8 +30,8 @@ https://www.direct-netware.de/redirect?licenses;gpl
 #echo(__FILEPATH__)#
 """
 
-from random import randrange
 from time import time
+from uuid import uuid4 as uuid
 
 try: from hashlib import sha3_256 as sha256
 except ImportError: from hashlib import sha256
@@ -43,8 +43,12 @@ from dpt_runtime.io_exception import IOException
 from dpt_runtime.type_exception import TypeException
 from dpt_settings import Settings
 from pas_database import ConditionDefinition, Connection, Instance, NothingMatchedException, SortDefinition
-from sqlalchemy.sql.expression import and_, or_
+from sqlalchemy.inspection import inspect
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.sql.expression import and_, cast, insert, or_, select, update
 from sqlalchemy.sql.functions import count as sql_count
+from sqlalchemy.sql.functions import min as sql_min
+from sqlalchemy.types import BIGINT
 
 from ..orm.task import Task as _DbTask
 
@@ -89,8 +93,18 @@ Task status is unknown
     """
 Task waits for execution
     """
+    PARAMS_COLUMNS = { "client": "client",
+                       "_lrt_hook": "lrt_hook",
+                       "_tid": "tid_value",
+                       "_timeout": "timeout_interval"
+                     }
+    """
+Task parameter keys mapped to the columns they are stored in additionally.
+The "client" value is stored JSON encoded as it is not restricted to
+strings.
+    """
 
-    __slots__ = [ "_id", "_hook", "_params", "_tid" ]
+    __slots__ = [ "_changed_attributes", "_id", "_hook", "_params", "_params_json", "_tid" ]
     """
 python.org: __slots__ reserves space for the declared variables and prevents
 the automatic creation of __dict__ and __weakref__ for each instance.
@@ -107,6 +121,10 @@ Constructor __init__(Database)
 
         Instance.__init__(self, db_instance)
 
+        self._changed_attributes = set()
+        """
+Task attributes changed since the instance has been loaded or saved
+        """
         self._id = None
         """
 Database ID used for reloading
@@ -118,6 +136,10 @@ Task hook to be called
         self._params = None
         """
 Task parameter specified
+        """
+        self._params_json = None
+        """
+Task parameter JSON data not yet decoded
         """
         self._tid = None
         """
@@ -128,13 +150,47 @@ Task ID
             with self:
                 self._id = self.local.db_instance.id
                 self._hook = self.local.db_instance.hook
-                if (self.local.db_instance.params != ""): self.params = JsonResource.json_to_data(self.local.db_instance.params)
-
-                if ("_tid" in self.params): self.tid = self.params['_tid']
+                if (self.local.db_instance.params not in ( None, "" )): self._params_json = self.local.db_instance.params
             #
         #
 
-        if (self._params is None): self._params = { }
+        if (self._params_json is None): self._params = { }
+        if (db_instance is None): self._changed_attributes.update(( "hook", "params", "tid" ))
+    #
+
+    @property
+    def client(self):
+        """
+Returns the client the task is restricted to.
+
+:return: (mixed) Client; None if not restricted
+:since:  v1.0.0
+        """
+
+        return self._get_params_value("client")
+    #
+
+    def _get_params_value(self, key, default = None):
+        """
+Returns the value of the given task parameter key. Keys stored in dedicated
+columns are read without decoding the task parameter JSON data.
+
+:param key: Task parameter key
+:param default: Default value if the key is not defined
+
+:return: (mixed) Task parameter value
+:since:  v1.0.0
+        """
+
+        if (self._params_json is not None and key in Task.PARAMS_COLUMNS):
+            with self: _return = getattr(self.local.db_instance, Task.PARAMS_COLUMNS[key])
+
+            if (_return is None):
+                _return = (self.params.get(key, default) if (key == "_tid") else default)
+            elif (key == "client"): _return = JsonResource.json_to_data(_return)
+        else: _return = self.params.get(key, default)
+
+        return _return
     #
 
     @property
@@ -146,10 +202,12 @@ Returns the task hook to be called.
 :since:  v1.0.0
         """
 
-        return (NamedClassLoader.get_instance("pas_tasks.tasks.DatabaseLrtHook", hook = self._hook, **self.params)
-                if (self.is_lrt) else
-                self._hook
-               )
+        if (self.is_lrt):
+            _return = NamedClassLoader.get_instance("pas_tasks.tasks.DatabaseLrtHook", hook = self._hook, **self.params)
+            _return.task = self
+        else: _return = self._hook
+
+        return _return
     #
 
     @hook.setter
@@ -163,6 +221,7 @@ Sets the task hook to be called.
         """
 
         self._hook = hook
+        self._changed_attributes.add("hook")
     #
 
     @property
@@ -194,7 +253,7 @@ Returns true if the task is a long running one.
 :since:  v1.0.0
         """
 
-        return self._params.get("_lrt_hook", False)
+        return self._get_params_value("_lrt_hook", False)
     #
 
     @property
@@ -222,6 +281,14 @@ Returns true if the task has a timeout value.
         return (self.timeout > 0)
     #
 
+    lease_expiry = Instance._data_attribute_property("lease_expiry")
+    """
+Returns the UNIX timestamp the lease of the owner expires.
+
+:return: (int) UNIX timestamp
+:since:  v1.0.0
+    """
+
     name = Instance._data_attribute_property("name")
     """
 Sets the task name.
@@ -231,15 +298,33 @@ Sets the task name.
 :since: v1.0.0
     """
 
+    owner = Instance._data_attribute_property("owner")
+    """
+Returns the worker ID of the daemon owning the task while it is queued or
+running.
+
+:return: (str) Worker ID
+:since:  v1.0.0
+    """
+
     @property
     def params(self):
         """
-Returns the task parameter used.
+Returns the task parameter used. The JSON data is decoded on first access.
+Changes are only saved if the task parameter are set again.
 
 :return: (dict) Task parameter
 :since:  v1.0.0
         """
 
+        if (self._params is None):
+            params_json = self._params_json
+            params = (None if (params_json is None) else JsonResource.json_to_data(params_json))
+
+            self._params = (params if (isinstance(params, dict)) else { })
+            self._params_json = None
+        #
+
         return self._params
     #
 
@@ -254,7 +339,14 @@ Sets the task parameter.
         """
 
         if (not isinstance(params, dict)): raise TypeException("Parameter given are invalid")
+
+        # Read the TID before the task parameter containing it are replaced
+        if (self._tid is None): self._tid = self._get_params_value("_tid")
+
         self._params = params
+        self._params_json = None
+
+        self._changed_attributes.add("params")
     #
 
     status = Instance._data_attribute_property("status")
@@ -274,6 +366,7 @@ Returns the task ID.
 :since:  v1.0.0
         """
 
+        if (self._tid is None): self._tid = self._get_params_value("_tid")
         return self._tid
     #
 
@@ -288,6 +381,7 @@ Sets the task ID.
         """
 
         self._tid = tid
+        self._changed_attributes.add("tid")
     #
 
     time_scheduled = Instance._data_attribute_property("time_scheduled")
@@ -322,6 +416,20 @@ Returns the UNIX timestamp this task will time out.
 :since:  v1.0.0
     """
 
+    @property
+    def timeout_interval(self):
+        """
+Returns the timeout in seconds a registered task is extended by if
+touched.
+
+:return: (float) Timeout in seconds; None if not registered with a
+         timeout
+:since:  v1.0.0
+        """
+
+        return self._get_params_value("_timeout")
+    #
+
     def _reload(self):
         """
 Implementation of the reloading SQLAlchemy database instance logic.
@@ -335,6 +443,40 @@ Implementation of the reloading SQLAlchemy database instance logic.
         else: Instance._reload(self)
     #
 
+    def _prepare_save(self):
+        """
+Sets the SQLAlchemy database instance values changed. The TID hash and the
+task parameter JSON data are only calculated again if they have been
+changed. The task parameter always contain the current TID as "_tid". The
+instance context must be entered.
+
+:since: v1.0.0
+        """
+
+        if ("tid" in self._changed_attributes): self.local.db_instance.tid = sha256(Binary.utf8_bytes(self.tid)).hexdigest()
+
+        # Task parameter still JSON encoded are unchanged and contain the current TID already
+        if ("tid" in self._changed_attributes or self._params is not None):
+            params = self.params
+
+            if (params.get("_tid") != self.tid):
+                params['_tid'] = self.tid
+                self.params = params
+            #
+        #
+
+        if (self.local.db_instance.name == ""): self.local.db_instance.name = Binary.utf8(self._hook[-100:])
+        if (self.local.db_instance.status is None): self.local.db_instance.status = Task.STATUS_WAITING
+        if ("hook" in self._changed_attributes): self.local.db_instance.hook = Binary.utf8(self._hook)
+
+        if ("params" in self._changed_attributes):
+            self.local.db_instance.params = Binary.utf8(JsonResource().data_to_json(self.params))
+            self._set_params_columns(self.local.db_instance, self.params)
+        #
+
+        self.local.db_instance.time_updated = int(time())
+    #
+
     def save(self):
         """
 Saves changes of the database task instance.
@@ -343,19 +485,42 @@ Saves changes of the database task instance.
         """
 
         with self:
-            self.local.db_instance.tid = sha256(Binary.utf8_bytes(self.tid)).hexdigest()
+            self._prepare_save()
+
+            Instance.save(self)
+            self._changed_attributes.clear()
+        #
+    #
 
-            hook = self.hook
-            self._params['_tid'] = self.tid
+    def save_status_transition(self, status, expected_status, **kwargs):
+        """
+Saves changes of the database task instance together with a status change
+with one UPDATE statement if the status stored is still the expected one.
 
-            if (self.local.db_instance.name == ""): self.local.db_instance.name = Binary.utf8(hook[-100:])
-            if (self.local.db_instance.status is None): self.local.db_instance.status = Task.STATUS_WAITING
-            self.local.db_instance.hook = Binary.utf8(hook)
-            self.local.db_instance.params = Binary.utf8(JsonResource().data_to_json(self.params))
-            self.local.db_instance.time_updated = int(time())
+:param status: New task status
+:param expected_status: Expected task status
+:param kwargs: Additional column values to be set
 
-            Instance.save(self)
+:return: (bool) True if the task status has been changed
+:since:  v1.0.0
+        """
+
+        with self:
+            self._prepare_save()
+
+            values = { attribute.key: attribute.value
+                       for attribute in inspect(self.local.db_instance).attrs
+                       if attribute.history.has_changes()
+                     }
+
+            values.update(kwargs)
+            values.pop("status", None)
+
+            _return = self.transition_status(status, expected_status, **values)
+            if (_return): self._changed_attributes.clear()
         #
+
+        return _return
     #
 
     def _set_data_attribute(self, attribute, value):
@@ -377,6 +542,32 @@ Sets data for the requested attribute.
         #
     #
 
+    @staticmethod
+    def _set_params_columns(db_instance, params):
+        """
+Sets the columns storing task parameter values additionally.
+
+:param db_instance: SQLAlchemy database instance or dict of values
+:param params: Task parameter
+
+:since: v1.0.0
+        """
+
+        is_dict = isinstance(db_instance, dict)
+
+        for key, column in Task.PARAMS_COLUMNS.items():
+            value = params.get(key)
+
+            if (key == "_lrt_hook"): value = bool(value)
+            elif (value is None or key == "_timeout"): pass
+            elif (key == "client"): value = Binary.utf8(JsonResource().data_to_json(value))
+            else: value = Binary.utf8(value)
+
+            if (is_dict): db_instance[column] = value
+            else: setattr(db_instance, column, value)
+        #
+    #
+
     def set_status_completed(self):
         """
 Sets the task status to "completed".
@@ -387,6 +578,114 @@ Sets the task status to "completed".
         self.set_data_attributes(status = Task.STATUS_COMPLETED)
     #
 
+    def transition_status(self, status, expected_status = None, **kwargs):
+        """
+Changes the task status with one UPDATE statement if the status stored is
+still the expected one. Other changes of this instance are not saved.
+
+:param status: New task status
+:param expected_status: Expected task status; None for the status known to
+                        this instance
+:param kwargs: Additional column values to be set
+
+:return: (bool) True if the task status has been changed
+:since:  v1.0.0
+        """
+
+        with self:
+            if (expected_status is None): expected_status = self.local.db_instance.status
+
+            values = kwargs
+            values['status'] = status
+            values['time_updated'] = int(time())
+
+            db_query = (update(_DbTask)
+                        .where(_DbTask.id == self.local.db_instance.id, _DbTask.status == expected_status)
+                        .values(**values)
+                       )
+
+            # Pending changes of this instance must not be flushed before the conditional UPDATE
+            with self.local.connection.no_autoflush: _return = (self.local.connection.execute(db_query).rowcount > 0)
+
+            if (_return):
+                for key, value in values.items(): set_committed_value(self.local.db_instance, key, value)
+            #
+        #
+
+        return _return
+    #
+
+    @staticmethod
+    def claim_next(limit = 1, owner = "", lease_time = 0):
+        """
+Claims up to the given number of due tasks by moving them from the
+"waiting" to the "queued" status in one statement. Rows locked by other
+transactions are skipped if supported by the database. Databases without
+support for "UPDATE ... RETURNING" claim each selected task with a status
+compare-and-set statement instead.
+
+:param limit: Maximum number of tasks to claim
+:param owner: Worker ID of the claiming daemon
+:param lease_time: Lease time in seconds
+
+:return: (list) List of claimed Task instances
+:since:  v1.0.0
+        """
+
+        _return = [ ]
+
+        with Connection.get_instance() as connection:
+            timestamp = int(time())
+
+            db_due_query = (select(_DbTask.id)
+                            .where(_DbTask.status == Task.STATUS_WAITING,
+                                   _DbTask.time_scheduled > 0,
+                                   _DbTask.time_scheduled <= timestamp,
+                                   or_(_DbTask.timeout == 0,
+                                       _DbTask.timeout >= timestamp
+                                      )
+                                  )
+                            .order_by(_DbTask.time_scheduled.asc())
+                            .limit(limit)
+                            .with_for_update(skip_locked = True)
+                           )
+
+            db_claim_values = { "status": Task.STATUS_QUEUED,
+                                "time_updated": timestamp,
+                                "owner": owner,
+                                "lease_expiry": timestamp + lease_time
+                              }
+
+            if (Task._is_update_returning_supported(connection)):
+                db_claim_query = (update(_DbTask)
+                                  .where(_DbTask.id.in_(db_due_query), _DbTask.status == Task.STATUS_WAITING)
+                                  .values(**db_claim_values)
+                                  .returning(_DbTask.id)
+                                 )
+
+                ids = [ row[0] for row in connection.execute(db_claim_query) ]
+            else:
+                ids = [ ]
+
+                for row in connection.execute(db_due_query).fetchall():
+                    db_claim_query = (update(_DbTask)
+                                      .where(_DbTask.id == row[0], _DbTask.status == Task.STATUS_WAITING)
+                                      .values(**db_claim_values)
+                                     )
+
+                    if (connection.execute(db_claim_query).rowcount > 0): ids.append(row[0])
+                #
+            #
+
+            if (len(ids) > 0):
+                db_query = connection.query(_DbTask).filter(_DbTask.id.in_(ids)).order_by(_DbTask.time_scheduled.asc())
+                for db_instance in db_query: _return.append(Task(db_instance))
+            #
+        #
+
+        return _return
+    #
+
     @staticmethod
     def _get_default_list_condition_definition():
         """
@@ -457,34 +756,130 @@ Load Task entry from database.
         _return = None
 
         if (db_instance is not None):
-            with Connection.get_instance() as connection:
+            with Connection.get_instance():
                 Instance._ensure_db_class(cls, db_instance)
 
                 _return = Task(db_instance)
                 if (_return.is_timed_out): _return = None
-
-                if ((not Settings.get("pas_database_auto_maintenance", False)) and randrange(0, 3) < 1):
-                    archive_timeout = int(Settings.get("pas_tasks_database_tasks_archive_timeout", 28)) * 86400
-                    timestamp = int(time())
-                    timestamp_archive = timestamp - archive_timeout
-
-                    if (connection.query(_DbTask)
-                        .filter(or_(and_(_DbTask.status == Task.STATUS_COMPLETED,
-                                         _DbTask.time_scheduled > 0,
-                                         _DbTask.time_scheduled < timestamp_archive
-                                        ),
-                                    and_(_DbTask.timeout > 0, _DbTask.timeout < timestamp)
-                                   )
-                               )
-                        .delete() > 0
-                       ): connection.optimize_random(_DbTask)
-                #
             #
         #
 
         return _return
     #
 
+    @staticmethod
+    def delete_archived(limit = 1000):
+        """
+Deletes up to the given number of timed out tasks and of completed ones
+older than the archive timeout.
+
+:param limit: Maximum number of tasks to delete
+
+:return: (int) Number of tasks deleted
+:since:  v1.0.0
+        """
+
+        archive_timeout = int(Settings.get("pas_tasks_database_tasks_archive_timeout", 28)) * 86400
+        timestamp = int(time())
+        timestamp_archive = timestamp - archive_timeout
+
+        with Connection.get_instance() as connection:
+            db_archived_query = (select(_DbTask.id)
+                                 .where(or_(and_(_DbTask.status == Task.STATUS_COMPLETED,
+                                                 _DbTask.time_scheduled > 0,
+                                                 _DbTask.time_scheduled < timestamp_archive
+                                                ),
+                                            and_(_DbTask.timeout > 0, _DbTask.timeout < timestamp)
+                                           )
+                                       )
+                                 .limit(limit)
+                                )
+
+            _return = (connection.query(_DbTask)
+                       .filter(_DbTask.id.in_(db_archived_query))
+                       .delete(synchronize_session = False)
+                      )
+
+            if (_return > 0): connection.optimize_random(_DbTask)
+        #
+
+        return _return
+    #
+
+    @staticmethod
+    def get_next_time_scheduled():
+        """
+Returns the UNIX timestamp of the waiting task to be executed next.
+
+:return: (int) UNIX timestamp; -1 if no task is scheduled
+:since:  v1.0.0
+        """
+
+        with Connection.get_instance() as connection:
+            _return = (connection.query(sql_min(_DbTask.time_scheduled))
+                       .filter(_DbTask.status == Task.STATUS_WAITING,
+                               _DbTask.time_scheduled > 0,
+                               or_(_DbTask.timeout == 0,
+                                   _DbTask.timeout >= int(time())
+                                  )
+                              )
+                       .scalar()
+                      )
+        #
+
+        return (-1 if (_return is None) else _return)
+    #
+
+    @staticmethod
+    def insert_many(tasks_data):
+        """
+Inserts new waiting tasks with one multi-row INSERT statement for each
+chunk of "pas_tasks_database_insert_chunk_size" tasks.
+
+:param tasks_data: List of dicts with the keys "tid", "hook", "params" and
+                   optionally "time_scheduled" and "timeout"
+
+:return: (int) Number of tasks inserted
+:since:  v1.0.0
+        """
+
+        chunk_size = int(Settings.get("pas_tasks_database_insert_chunk_size", 100))
+        timestamp = int(time())
+
+        rows = [ ]
+
+        for task_data in tasks_data:
+            tid = task_data['tid']
+            hook = task_data['hook']
+
+            params = task_data['params']
+            params['_tid'] = tid
+
+            row = { "id": uuid().hex,
+                    "tid": sha256(Binary.utf8_bytes(tid)).hexdigest(),
+                    "name": Binary.utf8(tid),
+                    "status": Task.STATUS_WAITING,
+                    "hook": Binary.utf8(hook),
+                    "params": Binary.utf8(JsonResource().data_to_json(params)),
+                    "time_started": timestamp,
+                    "time_scheduled": task_data.get("time_scheduled", 0),
+                    "time_updated": timestamp,
+                    "timeout": task_data.get("timeout", 0)
+                  }
+
+            Task._set_params_columns(row, params)
+            rows.append(row)
+        #
+
+        with Connection.get_instance() as connection:
+            for position in range(0, len(rows), chunk_size):
+                connection.execute(insert(_DbTask).values(rows[position:position + chunk_size]))
+            #
+        #
+
+        return len(rows)
+    #
+
     @classmethod
     def load_id(cls, _id):
         """
@@ -538,6 +933,26 @@ Load Task to be executed next.
         return _return
     #
 
+    @staticmethod
+    def _is_update_returning_supported(connection):
+        """
+Checks if the database of the given connection supports
+"UPDATE ... RETURNING" statements.
+
+:param connection: Database connection
+
+:return: (bool) True if supported
+:since:  v1.0.0
+        """
+
+        dialect = connection.get_bind().dialect
+
+        _return = getattr(dialect, "update_returning", None)
+        if (_return is None): _return = getattr(dialect, "full_returning", False)
+
+        return _return
+    #
+
     @classmethod
     def load_tid(cls, tid):
         """
@@ -562,6 +977,41 @@ Load Task value by ID.
         return _return
     #
 
+    @staticmethod
+    def touch_tid(tid):
+        """
+Pushes the timeout of the task with the given TID based on its timeout
+interval with one UPDATE statement.
+
+:param tid: Task ID
+
+:return: (bool) True on success
+:since:  v1.0.0
+        """
+
+        _return = False
+
+        if (tid is not None):
+            tid = sha256(Binary.utf8_bytes(tid)).hexdigest()
+
+            with Connection.get_instance() as connection:
+                timestamp = int(time())
+
+                _return = (connection.query(_DbTask)
+                           .filter(_DbTask.tid == tid,
+                                   _DbTask.timeout >= timestamp,
+                                   _DbTask.timeout_interval != None
+                                  )
+                           .update({ "time_updated": timestamp, "timeout": cast(timestamp + _DbTask.timeout_interval, BIGINT) },
+                                   synchronize_session = False
+                                  ) > 0
+                          )
+            #
+        #
+
+        return _return
+    #
+
     @classmethod
     def load_list(cls, condition_definition = None, offset = 0, limit = -1, sort_definition = None):
         """
@@ -604,6 +1054,45 @@ completed or are within the archived time frame.
         #
     #
 
+    @staticmethod
+    def _populate_params_columns(chunk_size = 1000):
+        """
+Populates the columns storing task parameter values additionally for all
+existing tasks.
+
+:param chunk_size: Number of tasks read at once
+
+:since: v1.0.0
+        """
+
+        with Connection.get_instance() as connection:
+            last_id = ""
+
+            while (True):
+                rows = (connection.query(_DbTask.id, _DbTask.params)
+                        .filter(_DbTask.id > last_id)
+                        .order_by(_DbTask.id.asc())
+                        .limit(chunk_size)
+                        .all()
+                       )
+
+                for row in rows:
+                    params = (None if (row[1] in ( None, "" )) else JsonResource.json_to_data(row[1]))
+
+                    if (isinstance(params, dict)):
+                        values = { }
+                        Task._set_params_columns(values, params)
+
+                        connection.query(_DbTask).filter(_DbTask.id == row[0]).update(values, synchronize_session = False)
+                    #
+                #
+
+                if (len(rows) < chunk_size): break
+                last_id = rows[-1][0]
+            #
+        #
+    #
+
     @staticmethod
     def _regenerate_tids():
         """
@@ -613,23 +1102,64 @@ Regenerates all task IDs based on the current hashing algorithm.
         """
 
         with Connection.get_instance():
-            for task in Task.load_list(ConditionDefinition()): task.save()
+            for task in Task.load_list(ConditionDefinition()):
+                # Mark the TID as changed to save it hashed again
+                task.tid = task.tid
+                task.save()
+            #
         #
     #
 
     @staticmethod
-    def _reset_stale_running():
+    def renew_leases(owner, lease_time):
         """
-Resets all stale tasks with the "running" status.
+Renews the lease of all queued or running tasks owned by the given worker.
 
-:since: v1.0.0
+:param owner: Worker ID
+:param lease_time: Lease time in seconds
+
+:return: (int) Number of tasks renewed
+:since:  v1.0.0
+        """
+
+        with Connection.get_instance() as connection:
+            return (connection.query(_DbTask)
+                    .filter(_DbTask.owner == owner,
+                            or_(_DbTask.status == Task.STATUS_QUEUED,
+                                _DbTask.status == Task.STATUS_RUNNING
+                               )
+                           )
+                    .update({ "lease_expiry": int(time()) + lease_time }, synchronize_session = False)
+                   )
+        #
+    #
+
+    @staticmethod
+    def _reset_stale_running(owner = None):
+        """
+Resets stale tasks with the "queued" or "running" status. Tasks are stale
+if their lease expired or if they are owned by the given worker.
+
+:param owner: Worker ID of a previous daemon instance
+
+:return: (int) Number of tasks reset
+:since:  v1.0.0
         """
 
         with Connection.get_instance() as connection:
-            connection.query(_DbTask).filter(or_(_DbTask.status == Task.STATUS_QUEUED,
-                                                 _DbTask.status == Task.STATUS_RUNNING
-                                                )
-                                            ).update({ "status": Task.STATUS_WAITING })
+            stale_condition = _DbTask.lease_expiry < int(time())
+            if (owner is not None): stale_condition = or_(stale_condition, _DbTask.owner == owner)
+
+            return (connection.query(_DbTask)
+                    .filter(or_(_DbTask.status == Task.STATUS_QUEUED,
+                                _DbTask.status == Task.STATUS_RUNNING
+                               ),
+                            stale_condition
+                           )
+                    .update({ "status": Task.STATUS_WAITING, "owner": "", "lease_expiry": 0 },
+                            synchronize_session = False
+                           )
+                   )
         #
     #
 #
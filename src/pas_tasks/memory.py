@@ -30,12 +30,14 @@ https://www.direct-netware.de/redirect?licenses;gpl
 #echo(__FILEPATH__)#
 """
 
-from copy import copy
 from time import time
 from weakref import ref
 
+from dpt_module_loader import NamedClassLoader
 from dpt_runtime.binary import Binary
+from dpt_runtime.value_exception import ValueException
 from dpt_threading.instance_lock import InstanceLock
+from dpt_settings import Settings
 from pas_timed_tasks import TimedTasksMixin
 
 from .abstract import Abstract
@@ -55,7 +57,7 @@ ones.
              GNU General Public License 2 or later
     """
 
-    __slots__ = [ "tasks" ] + TimedTasksMixin._mixin_slots_
+    __slots__ = [ "run_batch_limit", "tasks" ] + TimedTasksMixin._mixin_slots_
     """
 python.org: __slots__ reserves space for the declared variables and prevents
 the automatic creation of __dict__ and __weakref__ for each instance.
@@ -79,10 +81,20 @@ Constructor __init__(Memory)
         Abstract.__init__(self)
         TimedTasksMixin.__init__(self)
 
-        self.tasks = [ ]
+        self.run_batch_limit = int(Settings.get("pas_tasks_memory_run_batch_limit", 1000))
         """
-Cache for registered tasks
+Maximum number of due tasks activated per "run()" call; 0 for no limit
         """
+        self.tasks = None
+        """
+Scheduler holding registered tasks
+        """
+
+        scheduler_class_name = Settings.get("pas_tasks_memory_scheduler_implementation", "pas_tasks.schedulers.Heap")
+        scheduler_class = NamedClassLoader.get_class(scheduler_class_name)
+
+        if (scheduler_class is None): raise ValueException("Memory scheduler implementation '{0}' is not supported".format(scheduler_class_name))
+        self.tasks = scheduler_class()
     #
 
     @property
@@ -97,9 +109,7 @@ Get the implementation specific next "run()" UNIX timestamp.
 
         _return = -1
 
-        with self._lock:
-            if (len(self.tasks) > 0): _return = self.tasks[0]['timestamp']
-        #
+        with self._lock: _return = self.tasks.next_timestamp
 
         return _return
     #
@@ -125,6 +135,33 @@ Add a new task with the given TID to the storage for later activation.
         self._insert({ "hook": hook, "params": params, "tid": tid }, timeout)
     #
 
+    def add_many(self, tasks):
+        """
+Add the given tasks to the storage for later activation. Each task is
+defined by a dict with the keys "tid", "hook" and optionally "timeout" and
+"kwargs".
+
+:param tasks: List of task definitions
+
+:since: v1.0.0
+        """
+
+        tasks_params = [ ]
+
+        for task in tasks:
+            tid, hook, timeout, params = self._get_many_task_arguments(task)
+
+            tid = Binary.str(tid)
+            if (timeout is None): timeout = self.task_timeout
+
+            params['_tid'] = tid
+            tasks_params.append(( { "hook": hook, "params": params, "tid": tid }, timeout ))
+        #
+
+        self._insert_many(tasks_params)
+        if (self._log_handler is not None): self._log_handler.debug("{0!r} added {1:d} tasks", self, len(tasks_params), context = "pas_tasks")
+    #
+
     def _delete(self, tid):
         """
 Removes the given TID from the storage.
@@ -133,30 +170,14 @@ Removes the given TID from the storage.
 :since:  v1.0.0
         """
 
-        # pylint: disable=no-member
-
-        _return = False
-
         with self._lock:
-            index = len(self.tasks)
-
-            if (index > 0):
-                tasks = (self.tasks.copy() if (hasattr(self.tasks, "copy")) else copy(self.tasks))
-                tasks.reverse()
+            timestamp = self.tasks.next_timestamp
+            _return = self.tasks.remove(tid)
 
-                for position in range(index - 1, -1, -1):
-                    if (self.tasks[position]['tid'] == tid):
-                        index = position
-                        self.tasks.pop(position)
-                        _return = True
-
-                        break
-                    #
-                #
-            #
+            is_next_task_changed = (_return and timestamp != self.tasks.next_timestamp)
         #
 
-        if (index < 1): self.update_timestamp()
+        if (is_next_task_changed): self.update_timestamp()
         return _return
     #
 
@@ -170,18 +191,8 @@ Returns the task for the given TID.
 :since:  v1.0.0
         """
 
-        _return = None
-
         tid = Binary.str(tid)
-
-        with self._lock:
-            for position in range(0, len(self.tasks)):
-                if (self.tasks[position]['tid'] == tid):
-                    _return = self.tasks[position]
-                    break
-                #
-            #
-        #
+        with self._lock: _return = self.tasks.get(tid)
 
         return _return
     #
@@ -199,36 +210,35 @@ Add a new task with the given TID to the storage for later activation.
         if (self.is_started):
             timestamp = time() + timeout
 
-            with self._lock:
-                tasks_count = len(self.tasks)
-
-                if (timeout > self.task_timeout):
-                    index = 0
-
-                    if (tasks_count > 0):
-                        for position in range((tasks_count - 1), -1, -1):
-                            if (timestamp > self.tasks[position]['timestamp']):
-                                index = 1 + position
-                                break
-                            #
-                        #
-                    #
-                else:
-                    index = len(self.tasks)
-
-                    for position in range(0, tasks_count):
-                        if (timestamp < self.tasks[position]['timestamp']):
-                            index = position
-                            break
-                        #
-                    #
-                #
-
-                params['timestamp'] = timestamp
-                self.tasks.insert(index, params)
+            params['timestamp'] = timestamp
+            with self._lock: is_next_task = self.tasks.add(params['tid'], timestamp, params)
+
+            if (is_next_task): self.update_timestamp(timestamp)
+        #
+    #
+
+    def _insert_many(self, tasks_params):
+        """
+Add the given tasks to the storage for later activation with one scheduler
+call.
+
+:param tasks_params: List of ( params, timeout ) tuples
+
+:since: v1.0.0
+        """
+
+        if (self.is_started and len(tasks_params) > 0):
+            entries = [ ]
+            timestamp = time()
+
+            for params, timeout in tasks_params:
+                params['timestamp'] = timestamp + timeout
+                entries.append(( params['tid'], params['timestamp'], params ))
             #
 
-            if (index < 1): self.update_timestamp(timestamp)
+            with self._lock: is_next_task = self.tasks.add_many(entries)
+
+            if (is_next_task): self.update_timestamp()
         #
     #
 
@@ -243,18 +253,10 @@ Checks if a given task ID is known.
 :since:  v1.0.0
         """
 
-        _return = False
-
-        with self._lock:
-            for position in range(0, len(self.tasks)):
-                if (tid == self.tasks[position]['tid'] and (hook is None or hook == self.tasks[position]['hook'])):
-                    _return = True
-                    break
-                #
-            #
-        #
+        tid = Binary.str(tid)
+        with self._lock: task = self.tasks.get(tid)
 
-        return _return
+        return (task is not None and (hook is None or hook == task['hook']))
     #
 
     def register_timeout(self, tid, hook, timeout = None, **kwargs):
@@ -278,6 +280,33 @@ Registers a new task with the given TID to the storage for later use.
         self._insert({ "hook": hook, "params": params, "tid": tid, "_timeout": timeout }, timeout)
     #
 
+    def register_timeout_many(self, tasks):
+        """
+Registers the given tasks to the storage for later use. Each task is
+defined by a dict with the keys "tid", "hook" and optionally "timeout" and
+"kwargs".
+
+:param tasks: List of task definitions
+
+:since: v1.0.0
+        """
+
+        tasks_params = [ ]
+
+        for task in tasks:
+            tid, hook, timeout, params = self._get_many_task_arguments(task)
+
+            tid = Binary.str(tid)
+            if (timeout is None): timeout = self.task_timeout
+
+            params['_tid'] = tid
+            tasks_params.append(( { "hook": hook, "params": params, "tid": tid, "_timeout": timeout }, timeout ))
+        #
+
+        self._insert_many(tasks_params)
+        if (self._log_handler is not None): self._log_handler.debug("{0!r} registered {1:d} tasks", self, len(tasks_params), context = "pas_tasks")
+    #
+
     def remove(self, tid):
         """
 Removes the given TID from the storage.
@@ -305,17 +334,23 @@ Updates the task with the given TID to push its expiration time.
 :since:  v1.0.0
         """
 
+        _return = False
+        is_next_task = False
         tid = Binary.str(tid)
-        task = self.get(tid)
 
-        if (task is None): _return = False
-        else:
-            self.unregister_timeout(tid)
-            self.register_timeout(tid, task['hook'], task['_timeout'], task['params'])
+        with self._lock:
+            task = self.tasks.get(tid)
+
+            if (task is not None and "_timeout" in task):
+                timestamp = time() + task['_timeout']
+                task['timestamp'] = timestamp
 
-            _return = True
+                is_next_task = self.tasks.reschedule(tid, timestamp)
+                _return = True
+            #
         #
 
+        if (is_next_task): self.update_timestamp(timestamp)
         return _return
     #
 
@@ -326,19 +361,23 @@ Timed task execution
 :since: v1.0.0
         """
 
-        task = None
+        tasks = [ ]
 
         if (self.is_started):
             with self._lock:
-                if (len(self.tasks) > 0 and self.tasks[0]['timestamp'] <= time()): task = self.tasks.pop(0)
+                tasks = self.tasks.pop_due(time(), self.run_batch_limit)
                 TimedTasksMixin.run(self)
             #
         #
 
-        if (task is not None):
-            if ("_timeout" not in task): self._start_task(task)
+        tasks_data = [ ]
+
+        for task in tasks:
+            if ("_timeout" not in task): tasks_data.append(task)
             elif (self._log_handler is not None): self._log_handler.debug("{0!r} timed out TID '{1}'", self, task['tid'], context = "pas_tasks")
         #
+
+        if (len(tasks_data) > 0): self._start_tasks(tasks_data)
     #
 
     def unregister_timeout(self, tid):
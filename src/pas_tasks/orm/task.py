@@ -35,8 +35,9 @@ from uuid import uuid4 as uuid
 
 from pas_database.orm import Abstract
 from pas_database.types import DateTime
-from sqlalchemy.schema import Column
-from sqlalchemy.types import INT, TEXT, VARCHAR
+from sqlalchemy.schema import Column, Index
+from sqlalchemy.sql.expression import text
+from sqlalchemy.types import BIGINT, BOOLEAN, FLOAT, INT, TEXT, VARCHAR
 
 class Task(Abstract):
     """
@@ -61,12 +62,22 @@ the automatic creation of __dict__ and __weakref__ for each instance.
     __tablename__ = "{0}_task".format(Abstract.get_table_prefix())
     """
 SQLAlchemy table name
+    """
+    __table_args__ = ( Index("ix_{0}_status_time_scheduled".format(__tablename__),
+                             "status",
+                             "time_scheduled",
+                             postgresql_where = text("status = 96"),
+                             sqlite_where = text("status = 96")
+                            ),
+                     )
+    """
+SQLAlchemy table arguments
     """
     db_instance_class = "pas_tasks.instances.Task"
     """
 Encapsulating SQLAlchemy database instance class name
     """
-    db_schema_version = 3
+    db_schema_version = 6
     """
 Database schema version
     """
@@ -111,6 +122,30 @@ tasks.time_updated
     """
 tasks.timeout
     """
+    owner = Column(VARCHAR(100), index = True, server_default = "", nullable = False)
+    """
+tasks.owner
+    """
+    lease_expiry = Column(BIGINT, server_default = "0", nullable = False)
+    """
+tasks.lease_expiry
+    """
+    tid_value = Column(TEXT, index = True)
+    """
+tasks.tid_value
+    """
+    timeout_interval = Column(FLOAT)
+    """
+tasks.timeout_interval
+    """
+    lrt_hook = Column(BOOLEAN, server_default = "0", nullable = False)
+    """
+tasks.lrt_hook
+    """
+    client = Column(TEXT, index = True)
+    """
+tasks.client
+    """
 
     def __init__(self, *args, **kwargs):
         """
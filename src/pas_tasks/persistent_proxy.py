@@ -30,6 +30,7 @@ https://www.direct-netware.de/redirect?licenses;gpl
 #echo(__FILEPATH__)#
 """
 
+from copy import deepcopy
 from weakref import ref
 
 from dpt_runtime.binary import Binary
@@ -37,9 +38,12 @@ from dpt_runtime.operation_not_supported_exception import OperationNotSupportedE
 from dpt_runtime.type_exception import TypeException
 from dpt_settings import Settings
 from dpt_threading.instance_lock import InstanceLock
-from pas_bus import Client as BusClient
 
 from .abstract_persistent_proxy import AbstractPersistentProxy
+from .bus_client_pool import BusClientPool
+from .proxy_cache import ProxyCache
+from .proxy_outbox import ProxyOutbox
+from .touch_coalescer import TouchCoalescer
 from .tasks import PersistentLrtHook
 
 class PersistentProxy(AbstractPersistentProxy):
@@ -55,14 +59,31 @@ The task proxy forwards tasks to a background daemon executing it.
              GNU General Public License 2 or later
     """
 
-    __slots__ = [ "client" ]
+    __slots__ = [ "cache_size", "cache_ttl", "is_one_way", "touch_coalescing_window" ]
     """
 python.org: __slots__ reserves space for the declared variables and prevents
 the automatic creation of __dict__ and __weakref__ for each instance.
+    """
+    _cache = None
+    """
+Cache of "get()" and "is_registered()" results shared by all instances
+    """
+    _client_pool = None
+    """
+IPC bus client pool shared by all instances
     """
     _lock = InstanceLock()
     """
 Thread safety lock
+    """
+    _outbox = None
+    """
+Outbox of one-way requests shared by all instances
+    """
+    _touch_coalescer = None
+    """
+Coalescer of repeated "reregister_timeout()" touches shared by all
+instances
     """
     _weakref_instance = None
     """
@@ -78,40 +99,116 @@ Constructor __init__(PersistentProxy)
 
         AbstractPersistentProxy.__init__(self)
 
-        self.client = None
+        self.cache_size = int(Settings.get("pas_tasks_proxy_cache_size", 0))
+        """
+Maximum number of TIDs with cached results; 0 to disable caching. Tasks
+changed by other processes are only seen after the cache TTL.
         """
-IPC bus client
+        self.cache_ttl = float(Settings.get("pas_tasks_proxy_cache_ttl", 1))
+        """
+Time in seconds results are cached
+        """
+        self.is_one_way = Settings.get("pas_tasks_proxy_one_way", False)
+        """
+True to queue "add()", "register_timeout()" and "reregister_timeout()"
+requests in an outbox without awaiting the result
+        """
+        self.touch_coalescing_window = float(Settings.get("pas_tasks_proxy_touch_coalescing_window", 0))
+        """
+Time in seconds repeated touches of the same TID are coalesced; 0 to
+disable coalescing
         """
     #
 
-    def __del__(self):
+    @property
+    def cache(self):
         """
-Destructor __del__(PersistentProxy)
+Returns the cache of "get()" and "is_registered()" results shared by all
+instances.
 
-:since: v1.0.0
+:return: (object) ProxyCache instance; None if disabled or not connected
+:since:  v1.0.0
+        """
+
+        return PersistentProxy._cache
+    #
+
+    @property
+    def client_pool(self):
+        """
+Returns the IPC bus client pool shared by all instances.
+
+:return: (object) BusClientPool instance; None if not connected
+:since:  v1.0.0
+        """
+
+        return PersistentProxy._client_pool
+    #
+
+    @property
+    def outbox(self):
+        """
+Returns the outbox of one-way requests shared by all instances.
+
+:return: (object) ProxyOutbox instance; None if not used
+:since:  v1.0.0
+        """
+
+        return PersistentProxy._outbox
+    #
+
+    @property
+    def touch_coalescer(self):
+        """
+Returns the coalescer of repeated "reregister_timeout()" touches shared by
+all instances.
+
+:return: (object) TouchCoalescer instance; None if not used
+:since:  v1.0.0
         """
 
-        self.disconnect()
+        return PersistentProxy._touch_coalescer
     #
 
     def connect(self):
         """
-Opens a bus connection.
+Initializes the bus client pool and the request handling shared by all
+instances. Connections are opened on demand.
 
 :since: v1.0.0
         """
 
-        if (self.client is None): self.client = BusClient("pas_tasks_daemon")
+        with self._lock:
+            if (PersistentProxy._client_pool is None): PersistentProxy._client_pool = BusClientPool("pas_tasks_daemon")
+
+            if (self.cache_size > 0 and self.cache_ttl > 0 and PersistentProxy._cache is None):
+                PersistentProxy._cache = ProxyCache(self.cache_size, self.cache_ttl)
+            #
+
+            if (self.is_one_way and PersistentProxy._outbox is None):
+                PersistentProxy._outbox = ProxyOutbox(PersistentProxy._client_pool)
+            #
+
+            if (self.touch_coalescing_window > 0 and PersistentProxy._touch_coalescer is None):
+                PersistentProxy._touch_coalescer = TouchCoalescer(PersistentProxy._client_pool,
+                                                                  self.touch_coalescing_window,
+                                                                  PersistentProxy._outbox
+                                                                 )
+            #
+        #
     #
 
     def disconnect(self):
         """
-Closes an active bus connection.
+Sends all coalesced touches and queued one-way requests and closes all idle
+bus connections.
 
 :since: v1.0.0
         """
 
-        if (self.client is not None): self.client.disconnect()
+        if (self.touch_coalescer is not None): self.touch_coalescer.flush(True)
+        if (self.outbox is not None): self.outbox.flush()
+        if (self.client_pool is not None): self.client_pool.disconnect()
     #
 
     def add(self, tid, hook, timeout = None, **kwargs):
@@ -126,9 +223,29 @@ Add a new task with the given TID to the storage for later activation.
         """
 
         params = self._get_hook_proxy_params(hook, timeout, kwargs)
+        self.invalidate_cache(tid)
+
+        if (self.is_one_way):
+            params['tid'] = tid
+            self._put("pas.tasks.Persistent.addMany", "tasks", params)
+        else: self._request("pas.tasks.Persistent.add", tid = tid, **params)
+    #
+
+    def add_many(self, tasks):
+        """
+Add the given tasks to the storage for later activation with one bus
+request. Each task is defined by a dict with the keys "tid", "hook" and
+optionally "timeout" and "kwargs".
+
+:param tasks: List of task definitions
+
+:since: v1.0.0
+        """
+
+        tasks = self._get_many_hook_proxy_params(tasks)
+        for task in tasks: self.invalidate_cache(task['tid'])
 
-        self.connect()
-        self.client.request("pas.tasks.Persistent.add", tid = tid, **params)
+        self._request("pas.tasks.Persistent.addMany", tasks = tasks)
     #
 
     def call(self, params = None, last_return = None):
@@ -142,8 +259,8 @@ Called to initiate a task if its known and valid.
 :since:  v1.0.0
         """
 
-        self.connect()
-        return self.client.request("pas.tasks.Persistent.call", params = params, last_return = last_return)
+        if (isinstance(params, dict) and "tid" in params): self.invalidate_cache(params['tid'])
+        return self._request("pas.tasks.Persistent.call", params = params, last_return = last_return)
     #
 
     def get(self, tid):
@@ -156,8 +273,45 @@ Returns the task for the given TID.
 :since:  v1.0.0
         """
 
-        self.connect()
-        return self.client.request("pas.tasks.Persistent.get", tid = tid)
+        if (self.client_pool is None): self.connect()
+
+        cache = self.cache
+        is_cached, _return = (( False, None ) if (cache is None) else cache.get(tid, "get"))
+
+        if (not is_cached):
+            generation = (None if (cache is None) else cache.generation)
+            _return = self._request("pas.tasks.Persistent.get", tid = tid)
+
+            if (cache is not None): cache.set(tid, "get", _return, generation)
+        #
+
+        # Cached task definitions contain nested data that must not be shared with callers
+        return deepcopy(_return)
+    #
+
+    def _get_many_hook_proxy_params(self, tasks):
+        """
+Returns serializable parameters of the given task definitions for the
+persistent proxy.
+
+:param tasks: List of task definitions
+
+:return: (list) List of serializable task definitions
+:since:  v1.0.0
+        """
+
+        _return = [ ]
+
+        for task in tasks:
+            tid, hook, timeout, kwargs = self._get_many_task_arguments(task)
+
+            params = self._get_hook_proxy_params(hook, timeout, kwargs)
+            params['tid'] = tid
+
+            _return.append(params)
+        #
+
+        return _return
     #
 
     def _get_hook_proxy_params(self, hook, timeout = None, kwargs = None):
@@ -193,6 +347,19 @@ Returns serializable parameters for the persistent proxy.
         return _return
     #
 
+    def invalidate_cache(self, tid = None):
+        """
+Invalidates cached "get()" and "is_registered()" results. Should be called
+if a task has been changed without using this proxy.
+
+:param tid: Task ID; None to invalidate all results
+
+:since: v1.0.0
+        """
+
+        if (self.cache is not None): self.cache.invalidate(tid)
+    #
+
     def is_registered(self, tid, hook = None):
         """
 Checks if a given task ID is known.
@@ -204,10 +371,37 @@ Checks if a given task ID is known.
 :since:  v1.0.0
         """
 
+        if (self.client_pool is None): self.connect()
+
         params = ({ } if (hook is None) else self._get_hook_proxy_params(hook))
+        cache_key = ( "is_registered", params.get("hook") )
+
+        cache = self.cache
+        is_cached, _return = (( False, None ) if (cache is None) else cache.get(tid, cache_key))
 
-        self.connect()
-        return (True if (self.client.request("pas.tasks.Persistent.isRegistered", tid = tid, **params) == True) else False)
+        if (not is_cached):
+            generation = (None if (cache is None) else cache.generation)
+            _return = (True if (self._request("pas.tasks.Persistent.isRegistered", tid = tid, **params) == True) else False)
+
+            if (cache is not None): cache.set(tid, cache_key, _return, generation)
+        #
+
+        return _return
+    #
+
+    def _put(self, hook, argument, value):
+        """
+Queues a one-way request for the given "*Many" bus hook.
+
+:param hook: Bus hook accepting a list of values
+:param argument: Name of the list argument of the bus hook
+:param value: Value to be added to the list argument
+
+:since: v1.0.0
+        """
+
+        if (self.outbox is None): self.connect()
+        self.outbox.put(hook, argument, value)
     #
 
     def register_timeout(self, tid, hook, timeout = None, **kwargs):
@@ -222,9 +416,29 @@ Registers a new task with the given TID to the storage for later use.
         """
 
         params = self._get_hook_proxy_params(hook, timeout, kwargs)
+        self.invalidate_cache(tid)
 
-        self.connect()
-        self.client.request("pas.tasks.Persistent.registerTimeout", tid = tid, **params)
+        if (self.is_one_way):
+            params['tid'] = tid
+            self._put("pas.tasks.Persistent.registerTimeoutMany", "tasks", params)
+        else: self._request("pas.tasks.Persistent.registerTimeout", tid = tid, **params)
+    #
+
+    def register_timeout_many(self, tasks):
+        """
+Registers the given tasks to the storage for later use with one bus request.
+Each task is defined by a dict with the keys "tid", "hook" and optionally
+"timeout" and "kwargs".
+
+:param tasks: List of task definitions
+
+:since: v1.0.0
+        """
+
+        tasks = self._get_many_hook_proxy_params(tasks)
+        for task in tasks: self.invalidate_cache(task['tid'])
+
+        self._request("pas.tasks.Persistent.registerTimeoutMany", tasks = tasks)
     #
 
     def remove(self, tid):
@@ -237,20 +451,64 @@ Removes the given TID from the storage.
 :since:  v1.0.0
         """
 
-        self.connect()
-        return self.client.request("pas.tasks.Persistent.remove", tid = tid)
+        if (self.touch_coalescer is not None): self.touch_coalescer.discard(tid)
+        self.invalidate_cache(tid)
+
+        return self._request("pas.tasks.Persistent.remove", tid = tid)
+    #
+
+    def _request(self, *args, **kwargs):
+        """
+Requests the bus hook given as the first positional argument from the tasks
+daemon with a pooled bus connection. Keyword arguments are passed as is and
+may contain "hook". Queued one-way requests are sent first to keep the
+request order.
+
+:return: (mixed) Result data
+:since:  v1.0.0
+        """
+
+        if (self.client_pool is None): self.connect()
+        if (self.outbox is not None): self.outbox.flush()
+
+        return self.client_pool.request(*args, **kwargs)
     #
 
     def reregister_timeout(self, tid):
         """
-Updates the task with the given TID to push its expiration time.
+Updates the task with the given TID to push its expiration time. Repeated
+touches within the coalescing window are sent once at its end.
 
-:return: (bool) True on success
+:return: (bool) True on success; True if queued in one-way mode or
+         coalesced
 :since:  v1.0.0
         """
 
-        self.connect()
-        return self.client.request("pas.tasks.Persistent.reregisterTimeout", tid = tid)
+        if (self.client_pool is None): self.connect()
+        self.invalidate_cache(tid)
+
+        if (self.touch_coalescer is not None and self.touch_coalescer.touch(tid)): _return = True
+        elif (self.is_one_way):
+            self._put("pas.tasks.Persistent.reregisterTimeoutMany", "tids", tid)
+            _return = True
+        else: _return = self._request("pas.tasks.Persistent.reregisterTimeout", tid = tid)
+
+        return _return
+    #
+
+    def reregister_timeout_many(self, tids):
+        """
+Updates the tasks with the given TIDs to push their expiration time with
+one bus request.
+
+:param tids: List of task IDs
+
+:return: (int) Number of tasks updated
+:since:  v1.0.0
+        """
+
+        for tid in tids: self.invalidate_cache(tid)
+        return self._request("pas.tasks.Persistent.reregisterTimeoutMany", tids = tids)
     #
 
     def unregister_timeout(self, tid):
@@ -261,8 +519,10 @@ Removes the given TID from the storage.
 :since:  v1.0.0
         """
 
-        self.connect()
-        return self.client.request("pas.tasks.Persistent.unregisterTimeout", tid = tid)
+        if (self.touch_coalescer is not None): self.touch_coalescer.discard(tid)
+        self.invalidate_cache(tid)
+
+        return self._request("pas.tasks.Persistent.unregisterTimeout", tid = tid)
     #
 
     @staticmethod
@@ -288,6 +548,39 @@ Get the PersistentProxy singleton.
         return _return
     #
 
+    @staticmethod
+    def shutdown():
+        """
+Sends all coalesced touches and queued one-way requests, stops the flushing
+threads and closes all idle bus connections shared by all instances.
+
+:since: v1.0.0
+        """
+
+        with PersistentProxy._lock:
+            client_pool = PersistentProxy._client_pool
+            outbox = PersistentProxy._outbox
+            touch_coalescer = PersistentProxy._touch_coalescer
+
+            PersistentProxy._cache = None
+            PersistentProxy._client_pool = None
+            PersistentProxy._outbox = None
+            PersistentProxy._touch_coalescer = None
+        #
+
+        if (touch_coalescer is not None):
+            touch_coalescer.stop()
+            touch_coalescer.flush(True)
+        #
+
+        if (outbox is not None):
+            outbox.stop()
+            outbox.flush()
+        #
+
+        if (client_pool is not None): client_pool.disconnect()
+    #
+
     @staticmethod
     def is_available():
         """
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;tasks
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasTasksVersion)#
+#echo(__FILEPATH__)#
+"""
+
+from collections import OrderedDict
+from time import time
+
+from dpt_threading.thread_lock import ThreadLock
+
+class ProxyCache(object):
+    """
+A "ProxyCache" keeps results of read requests indexed by TID for a limited
+time. The least recently used TIDs are discarded if the cache is full.
+Results requested before an invalidation are not cached.
+
+:author:     direct Netware Group et al.
+:copyright:  direct Netware Group - All rights reserved
+:package:    pas
+:subpackage: tasks
+:since:      v1.0.0
+:license:    https://www.direct-netware.de/redirect?licenses;gpl
+             GNU General Public License 2 or later
+    """
+
+    ENTRY_EXPIRY = 0
+    """
+Cache entry position of the UNIX timestamp the entry expires
+    """
+    ENTRY_VALUES = 1
+    """
+Cache entry position of the dict of cached results
+    """
+
+    __slots__ = [ "_entries", "_generation", "_lock", "size", "ttl" ]
+    """
+python.org: __slots__ reserves space for the declared variables and prevents
+the automatic creation of __dict__ and __weakref__ for each instance.
+    """
+
+    def __init__(self, size, ttl):
+        """
+Constructor __init__(ProxyCache)
+
+:param size: Maximum number of cached TIDs
+:param ttl: Time in seconds results are cached
+
+:since: v1.0.0
+        """
+
+        self._entries = OrderedDict()
+        """
+Cache entries of [ expiry, values ] in least recently used order
+        """
+        self._generation = 0
+        """
+Counter incremented for each invalidation
+        """
+        self._lock = ThreadLock()
+        """
+Thread safety lock
+        """
+        self.size = size
+        """
+Maximum number of cached TIDs
+        """
+        self.ttl = ttl
+        """
+Time in seconds results are cached
+        """
+    #
+
+    @property
+    def generation(self):
+        """
+Returns the invalidation counter to be given to "set()" for results
+requested afterwards.
+
+:return: (int) Invalidation counter
+:since:  v1.0.0
+        """
+
+        return self._generation
+    #
+
+    def get(self, tid, key):
+        """
+Returns the cached result for the given TID and key.
+
+:param tid: Task ID
+:param key: Result key
+
+:return: (tuple) True and the result if cached; False and None otherwise
+:since:  v1.0.0
+        """
+
+        _return = ( False, None )
+
+        with self._lock:
+            entry = self._entries.get(tid)
+
+            if (entry is not None):
+                if (entry[ProxyCache.ENTRY_EXPIRY] <= time()): del(self._entries[tid])
+                elif (key in entry[ProxyCache.ENTRY_VALUES]):
+                    self._entries.move_to_end(tid)
+                    _return = ( True, entry[ProxyCache.ENTRY_VALUES][key] )
+                #
+            #
+        #
+
+        return _return
+    #
+
+    def invalidate(self, tid = None):
+        """
+Invalidates the cached results of the given TID.
+
+:param tid: Task ID; None to invalidate all results
+
+:since: v1.0.0
+        """
+
+        with self._lock:
+            if (tid is None): self._entries.clear()
+            else: self._entries.pop(tid, None)
+
+            self._generation += 1
+        #
+    #
+
+    def set(self, tid, key, value, generation):
+        """
+Caches the result for the given TID and key if no invalidation happened
+since the given invalidation counter has been read.
+
+:param tid: Task ID
+:param key: Result key
+:param value: Result
+:param generation: Invalidation counter read before the result has been
+                   requested
+
+:since: v1.0.0
+        """
+
+        with self._lock:
+            if (generation == self._generation):
+                timestamp = time()
+                entry = self._entries.get(tid)
+
+                if (entry is None or entry[ProxyCache.ENTRY_EXPIRY] <= timestamp):
+                    entry = [ timestamp + self.ttl, { } ]
+                    self._entries[tid] = entry
+                #
+
+                entry[ProxyCache.ENTRY_VALUES][key] = value
+                self._entries.move_to_end(tid)
+
+                while (len(self._entries) > self.size): self._entries.popitem(False)
+            #
+        #
+    #
+#
@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;tasks
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasTasksVersion)#
+#echo(__FILEPATH__)#
+"""
+
+from collections import deque
+from threading import Condition, Lock
+from time import time
+
+from dpt_module_loader import NamedClassLoader
+from dpt_settings import Settings
+from dpt_threading.thread import Thread
+
+class ProxyOutbox(object):
+    """
+A "ProxyOutbox" queues one-way proxy requests and sends them in batches
+using the "*Many" bus hooks of the tasks daemon. Results are not awaited.
+
+:author:     direct Netware Group et al.
+:copyright:  direct Netware Group - All rights reserved
+:package:    pas
+:subpackage: tasks
+:since:      v1.0.0
+:license:    https://www.direct-netware.de/redirect?licenses;gpl
+             GNU General Public License 2 or later
+    """
+
+    # pylint: disable=broad-except
+
+    __slots__ = [ "batch_size",
+                  "client_pool",
+                  "_condition",
+                  "flush_interval",
+                  "_flush_lock",
+                  "_is_started",
+                  "_log_handler",
+                  "_queue",
+                  "size",
+                  "_timestamp_queued"
+                ]
+    """
+python.org: __slots__ reserves space for the declared variables and prevents
+the automatic creation of __dict__ and __weakref__ for each instance.
+    """
+
+    def __init__(self, client_pool, size = None, batch_size = None, flush_interval = None):
+        """
+Constructor __init__(ProxyOutbox)
+
+:param client_pool: Bus client pool used to send requests
+:param size: Maximum number of queued requests
+:param batch_size: Maximum number of requests sent in one bus request
+:param flush_interval: Maximum time in seconds a request is queued
+
+:since: v1.0.0
+        """
+
+        if (size is None): size = int(Settings.get("pas_tasks_proxy_outbox_size", 1024))
+        if (batch_size is None): batch_size = int(Settings.get("pas_tasks_proxy_outbox_batch_size", 100))
+        if (flush_interval is None): flush_interval = float(Settings.get("pas_tasks_proxy_outbox_flush_interval", 0.1))
+
+        self.batch_size = max(1, batch_size)
+        """
+Maximum number of requests sent in one bus request
+        """
+        self.client_pool = client_pool
+        """
+Bus client pool used to send requests
+        """
+        self._condition = Condition()
+        """
+Condition used to notify the flushing thread
+        """
+        self.flush_interval = flush_interval
+        """
+Maximum time in seconds a request is queued
+        """
+        self._flush_lock = Lock()
+        """
+Lock held while queued requests are sent to keep their order
+        """
+        self._is_started = False
+        """
+True if the flushing thread has been started
+        """
+        self._log_handler = NamedClassLoader.get_singleton("dpt_logging.LogHandler", False)
+        """
+The LogHandler is called whenever debug messages should be logged or errors
+happened.
+        """
+        self._queue = deque()
+        """
+Queue of ( hook, argument name, value ) requests
+        """
+        self.size = size
+        """
+Maximum number of queued requests
+        """
+        self._timestamp_queued = -1
+        """
+UNIX timestamp the oldest queued request has been added
+        """
+    #
+
+    def flush(self):
+        """
+Sends all queued requests. Consecutive requests for the same bus hook are
+combined up to the batch size. Requests already being sent by another
+thread are completed before this method returns.
+
+:since: v1.0.0
+        """
+
+        with self._flush_lock:
+            while (True):
+                with self._condition:
+                    if (len(self._queue) < 1):
+                        self._timestamp_queued = -1
+                        break
+                    #
+
+                    hook, argument, value = self._queue.popleft()
+                    values = [ value ]
+
+                    while (len(values) < self.batch_size
+                           and len(self._queue) > 0
+                           and self._queue[0][0] == hook
+                          ): values.append(self._queue.popleft()[2])
+                #
+
+                try: self.client_pool.request(hook, **{ argument: values })
+                except Exception as handled_exception:
+                    if (self._log_handler is not None): self._log_handler.error(handled_exception, context = "pas_tasks")
+                #
+            #
+        #
+    #
+
+    def put(self, hook, argument, value):
+        """
+Queues a request for the given "*Many" bus hook. The calling thread sends
+all queued requests itself if the outbox is full.
+
+:param hook: Bus hook accepting a list of values
+:param argument: Name of the list argument of the bus hook
+:param value: Value to be added to the list argument
+
+:since: v1.0.0
+        """
+
+        if (not self._is_started): self.start()
+
+        with self._condition:
+            is_full = (self.size > 0 and len(self._queue) >= self.size)
+
+            if (not is_full):
+                is_empty = (len(self._queue) < 1)
+                if (is_empty): self._timestamp_queued = time()
+
+                self._queue.append(( hook, argument, value ))
+
+                # The flushing thread waits without timeout while the queue is empty
+                if (is_empty or len(self._queue) >= self.batch_size): self._condition.notify()
+            #
+        #
+
+        if (is_full):
+            self.flush()
+            self.put(hook, argument, value)
+        #
+    #
+
+    def _run_flusher(self):
+        """
+Flushing thread loop sending queued requests if the batch size or the
+flush interval is reached.
+
+:since: v1.0.0
+        """
+
+        while (True):
+            with self._condition:
+                while (self._is_started):
+                    if (len(self._queue) >= self.batch_size): break
+
+                    if (self._timestamp_queued < 0): self._condition.wait()
+                    else:
+                        timeout = self._timestamp_queued + self.flush_interval - time()
+                        if (timeout <= 0): break
+
+                        self._condition.wait(timeout)
+                    #
+                #
+
+                is_started = self._is_started
+            #
+
+            self.flush()
+            if (not is_started): break
+        #
+    #
+
+    def start(self):
+        """
+Starts the flushing thread.
+
+:since: v1.0.0
+        """
+
+        with self._condition:
+            if (not self._is_started):
+                self._is_started = True
+
+                thread = Thread(target = self._run_flusher)
+                thread.daemon = True
+                thread.start()
+            #
+        #
+    #
+
+    def stop(self):
+        """
+Stops the flushing thread after all queued requests have been sent.
+
+:since: v1.0.0
+        """
+
+        with self._condition:
+            if (self._is_started):
+                self._is_started = False
+                self._condition.notify_all()
+            #
+        #
+    #
+#
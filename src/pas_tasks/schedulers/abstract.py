@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;tasks
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasTasksVersion)#
+#echo(__FILEPATH__)#
+"""
+
+from dpt_runtime.not_implemented_exception import NotImplementedException
+
+class Abstract(object):
+    """
+Schedulers hold the tasks of a "Memory" task store ordered by their
+activation UNIX timestamp. Instances are not thread safe and rely on the
+lock of the task store using them.
+
+:author:     direct Netware Group et al.
+:copyright:  direct Netware Group - All rights reserved
+:package:    pas
+:subpackage: tasks
+:since:      v1.0.0
+:license:    https://www.direct-netware.de/redirect?licenses;gpl
+             GNU General Public License 2 or later
+    """
+
+    # pylint: disable=unused-argument
+
+    __slots__ = [ ]
+    """
+python.org: __slots__ reserves space for the declared variables and prevents
+the automatic creation of __dict__ and __weakref__ for each instance.
+    """
+
+    def __len__(self):
+        """
+python.org: Called to implement the built-in function len().
+
+:return: (int) Number of scheduled tasks
+:since:  v1.0.0
+        """
+
+        raise NotImplementedException()
+    #
+
+    @property
+    def next_timestamp(self):
+        """
+Returns the UNIX timestamp of the task to be activated next.
+
+:return: (float) UNIX timestamp; -1 if no task is scheduled
+:since:  v1.0.0
+        """
+
+        raise NotImplementedException()
+    #
+
+    def add(self, tid, timestamp, task):
+        """
+Schedules the given task for activation at the given UNIX timestamp. A task
+already scheduled with the same TID is replaced.
+
+:param tid: Task ID
+:param timestamp: UNIX timestamp
+:param task: Task definition
+
+:return: (bool) True if the task is the next one to be activated
+:since:  v1.0.0
+        """
+
+        raise NotImplementedException()
+    #
+
+    def add_many(self, entries):
+        """
+Schedules the given tasks. Tasks already scheduled with the same TID are
+replaced.
+
+:param entries: List of ( tid, timestamp, task ) tuples
+
+:return: (bool) True if one of the tasks is the next one to be activated
+:since:  v1.0.0
+        """
+
+        _return = False
+
+        for tid, timestamp, task in entries:
+            if (self.add(tid, timestamp, task)): _return = True
+        #
+
+        return _return
+    #
+
+    def get(self, tid):
+        """
+Returns the task for the given TID.
+
+:param tid: Task ID
+
+:return: (dict) Task definition; None if not scheduled
+:since:  v1.0.0
+        """
+
+        raise NotImplementedException()
+    #
+
+    def pop_due(self, timestamp, limit = 0):
+        """
+Removes and returns all tasks due at the given UNIX timestamp in the order
+of activation.
+
+:param timestamp: UNIX timestamp
+:param limit: Maximum number of tasks returned; 0 for no limit
+
+:return: (list) Task definitions
+:since:  v1.0.0
+        """
+
+        raise NotImplementedException()
+    #
+
+    def reschedule(self, tid, timestamp):
+        """
+Moves the scheduled task with the given TID to the given UNIX timestamp.
+
+:param tid: Task ID
+:param timestamp: UNIX timestamp
+
+:return: (bool) True if the task is the next one to be activated
+:since:  v1.0.0
+        """
+
+        raise NotImplementedException()
+    #
+
+    def remove(self, tid):
+        """
+Removes the task with the given TID.
+
+:param tid: Task ID
+
+:return: (bool) True on success
+:since:  v1.0.0
+        """
+
+        raise NotImplementedException()
+    #
+#
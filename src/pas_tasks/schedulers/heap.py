@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;tasks
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasTasksVersion)#
+#echo(__FILEPATH__)#
+"""
+
+from heapq import heapify, heappop, heappush
+
+from .abstract import Abstract
+
+class Heap(Abstract):
+    """
+The "Heap" scheduler keeps tasks in a binary heap. Tasks are indexed by
+their TID. Removed tasks are only marked and discarded lazily if they reach
+the top of the heap or if the heap is compacted.
+
+:author:     direct Netware Group et al.
+:copyright:  direct Netware Group - All rights reserved
+:package:    pas
+:subpackage: tasks
+:since:      v1.0.0
+:license:    https://www.direct-netware.de/redirect?licenses;gpl
+             GNU General Public License 2 or later
+    """
+
+    __slots__ = [ "_entries", "_heap", "_removed_count", "_sequence" ]
+    """
+python.org: __slots__ reserves space for the declared variables and prevents
+the automatic creation of __dict__ and __weakref__ for each instance.
+    """
+    ENTRY_TIMESTAMP = 0
+    """
+Heap entry position of the UNIX timestamp
+    """
+    ENTRY_SEQUENCE = 1
+    """
+Heap entry position of the insertion sequence number
+    """
+    ENTRY_TASK = 2
+    """
+Heap entry position of the task definition; None if removed
+    """
+    ENTRY_TID = 3
+    """
+Heap entry position of the task ID
+    """
+
+    def __init__(self):
+        """
+Constructor __init__(Heap)
+
+:since: v1.0.0
+        """
+
+        Abstract.__init__(self)
+
+        self._entries = { }
+        """
+Heap entries indexed by TID
+        """
+        self._heap = [ ]
+        """
+Binary heap of [ timestamp, sequence, task, tid ] entries
+        """
+        self._removed_count = 0
+        """
+Number of entries marked as removed
+        """
+        self._sequence = 0
+        """
+Insertion sequence number to keep tasks with equal timestamps in order
+        """
+    #
+
+    def __len__(self):
+        """
+python.org: Called to implement the built-in function len().
+
+:return: (int) Number of scheduled tasks
+:since:  v1.0.0
+        """
+
+        return len(self._entries)
+    #
+
+    @property
+    def next_timestamp(self):
+        """
+Returns the UNIX timestamp of the task to be activated next.
+
+:return: (float) UNIX timestamp; -1 if no task is scheduled
+:since:  v1.0.0
+        """
+
+        return (self._heap[0][Heap.ENTRY_TIMESTAMP] if (len(self._heap) > 0) else -1)
+    #
+
+    def add(self, tid, timestamp, task):
+        """
+Schedules the given task for activation at the given UNIX timestamp. A task
+already scheduled with the same TID is replaced.
+
+:param tid: Task ID
+:param timestamp: UNIX timestamp
+:param task: Task definition
+
+:return: (bool) True if the task is the next one to be activated
+:since:  v1.0.0
+        """
+
+        if (tid in self._entries): self.remove(tid)
+
+        self._sequence += 1
+
+        entry = [ timestamp, self._sequence, task, tid ]
+        heappush(self._heap, entry)
+        self._entries[tid] = entry
+
+        return (self._heap[0] is entry)
+    #
+
+    def add_many(self, entries):
+        """
+Schedules the given tasks. Tasks already scheduled with the same TID are
+replaced. Large batches are appended and the heap is rebuilt once.
+
+:param entries: List of ( tid, timestamp, task ) tuples
+
+:return: (bool) True if one of the tasks is the next one to be activated
+:since:  v1.0.0
+        """
+
+        if (len(entries) < (len(self._heap) >> 4)): _return = Abstract.add_many(self, entries)
+        else:
+            sequence = self._sequence
+
+            for tid, timestamp, task in entries:
+                if (tid in self._entries): self.remove(tid)
+
+                self._sequence += 1
+
+                entry = [ timestamp, self._sequence, task, tid ]
+                self._heap.append(entry)
+                self._entries[tid] = entry
+            #
+
+            heapify(self._heap)
+            self._discard_removed_top()
+
+            _return = (len(self._heap) > 0 and self._heap[0][Heap.ENTRY_SEQUENCE] > sequence)
+        #
+
+        return _return
+    #
+
+    def _compact(self):
+        """
+Rebuilds the heap without entries marked as removed.
+
+:since: v1.0.0
+        """
+
+        self._heap = [ entry for entry in self._heap if entry[Heap.ENTRY_TASK] is not None ]
+        heapify(self._heap)
+
+        self._removed_count = 0
+    #
+
+    def _discard_removed_top(self):
+        """
+Discards entries marked as removed from the top of the heap.
+
+:since: v1.0.0
+        """
+
+        while (len(self._heap) > 0 and self._heap[0][Heap.ENTRY_TASK] is None):
+            heappop(self._heap)
+            self._removed_count -= 1
+        #
+    #
+
+    def get(self, tid):
+        """
+Returns the task for the given TID.
+
+:param tid: Task ID
+
+:return: (dict) Task definition; None if not scheduled
+:since:  v1.0.0
+        """
+
+        entry = self._entries.get(tid)
+        return (None if (entry is None) else entry[Heap.ENTRY_TASK])
+    #
+
+    def pop_due(self, timestamp, limit = 0):
+        """
+Removes and returns all tasks due at the given UNIX timestamp in the order
+of activation.
+
+:param timestamp: UNIX timestamp
+:param limit: Maximum number of tasks returned; 0 for no limit
+
+:return: (list) Task definitions
+:since:  v1.0.0
+        """
+
+        _return = [ ]
+
+        while (len(self._heap) > 0
+               and self._heap[0][Heap.ENTRY_TIMESTAMP] <= timestamp
+               and (limit < 1 or len(_return) < limit)
+              ):
+            entry = heappop(self._heap)
+            del(self._entries[entry[Heap.ENTRY_TID]])
+
+            _return.append(entry[Heap.ENTRY_TASK])
+            self._discard_removed_top()
+        #
+
+        return _return
+    #
+
+    def reschedule(self, tid, timestamp):
+        """
+Moves the scheduled task with the given TID to the given UNIX timestamp.
+The previous heap entry is marked as removed and the task is pushed again.
+
+:param tid: Task ID
+:param timestamp: UNIX timestamp
+
+:return: (bool) True if the task is the next one to be activated
+:since:  v1.0.0
+        """
+
+        entry_removed = self._entries[tid]
+
+        self._sequence += 1
+
+        entry = [ timestamp, self._sequence, entry_removed[Heap.ENTRY_TASK], tid ]
+        heappush(self._heap, entry)
+        self._entries[tid] = entry
+
+        entry_removed[Heap.ENTRY_TASK] = None
+        self._removed_count += 1
+
+        if (self._heap[0] is entry_removed): self._discard_removed_top()
+        elif (self._removed_count > (len(self._heap) / 2)): self._compact()
+
+        return (self._heap[0] is entry)
+    #
+
+    def remove(self, tid):
+        """
+Removes the task with the given TID.
+
+:param tid: Task ID
+
+:return: (bool) True on success
+:since:  v1.0.0
+        """
+
+        entry = self._entries.pop(tid, None)
+        _return = (entry is not None)
+
+        if (_return):
+            entry[Heap.ENTRY_TASK] = None
+            self._removed_count += 1
+
+            if (self._heap[0] is entry): self._discard_removed_top()
+            elif (self._removed_count > (len(self._heap) / 2)): self._compact()
+        #
+
+        return _return
+    #
+#
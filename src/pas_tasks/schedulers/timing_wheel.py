@@ -0,0 +1,486 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;tasks
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasTasksVersion)#
+#echo(__FILEPATH__)#
+"""
+
+from time import time
+
+from dpt_runtime.value_exception import ValueException
+from dpt_settings import Settings
+
+from .abstract import Abstract
+
+class TimingWheel(Abstract):
+    """
+The "TimingWheel" scheduler keeps tasks in a hierarchical timing wheel.
+Adding and removing tasks is done in constant time. Tasks are activated
+with the configured tick resolution but never before their UNIX timestamp.
+
+:author:     direct Netware Group et al.
+:copyright:  direct Netware Group - All rights reserved
+:package:    pas
+:subpackage: tasks
+:since:      v1.0.0
+:license:    https://www.direct-netware.de/redirect?licenses;gpl
+             GNU General Public License 2 or later
+    """
+
+    ENTRY_TICK = 0
+    """
+Wheel entry position of the activation tick
+    """
+    ENTRY_TIMESTAMP = 1
+    """
+Wheel entry position of the UNIX timestamp
+    """
+    ENTRY_TASK = 2
+    """
+Wheel entry position of the task definition
+    """
+    ENTRY_TID = 3
+    """
+Wheel entry position of the task ID
+    """
+    ENTRY_SLOT = 4
+    """
+Wheel entry position of the slot containing the entry
+    """
+    ENTRY_LEVEL = 5
+    """
+Wheel entry position of the wheel level; -1 if due
+    """
+    LEVEL_BITS = ( 8, 6, 6, 6, 6 )
+    """
+Number of bits of the tick value covered by each wheel level
+    """
+
+    __slots__ = [ "_due", "_entries", "_is_due_sorted", "_level_counts", "_levels", "resolution", "_tick" ]
+    """
+python.org: __slots__ reserves space for the declared variables and prevents
+the automatic creation of __dict__ and __weakref__ for each instance.
+    """
+
+    def __init__(self, resolution = None):
+        """
+Constructor __init__(TimingWheel)
+
+:param resolution: Tick resolution in seconds; None to use the configured
+                   value
+
+:since: v1.0.0
+        """
+
+        Abstract.__init__(self)
+
+        if (resolution is None): resolution = float(Settings.get("pas_tasks_memory_timing_wheel_resolution", 1))
+        if (resolution <= 0): raise ValueException("Timing wheel resolution given is invalid")
+
+        self._due = { }
+        """
+Due entries in the order of activation
+        """
+        self._entries = { }
+        """
+Wheel entries indexed by TID
+        """
+        self._is_due_sorted = True
+        """
+False if an entry already due has been added after later ones
+        """
+        self._level_counts = [ 0 for _ in TimingWheel.LEVEL_BITS ]
+        """
+Number of entries per wheel level
+        """
+        self._levels = [ [ { } for _ in range(1 << bits) ] for bits in TimingWheel.LEVEL_BITS ]
+        """
+Wheel levels of slots containing entries indexed by TID
+        """
+        self.resolution = resolution
+        """
+Tick resolution in seconds
+        """
+        self._tick = int(time() / resolution)
+        """
+Next tick to be processed
+        """
+    #
+
+    def __len__(self):
+        """
+python.org: Called to implement the built-in function len().
+
+:return: (int) Number of scheduled tasks
+:since:  v1.0.0
+        """
+
+        return len(self._entries)
+    #
+
+    @property
+    def next_timestamp(self):
+        """
+Returns the UNIX timestamp of the task to be activated next. The timestamp
+of the next wheel level cascade moving entries is returned if the first
+wheel level is empty.
+
+:return: (float) UNIX timestamp; -1 if no task is scheduled
+:since:  v1.0.0
+        """
+
+        _return = -1
+
+        if (len(self._due) > 0):
+            if (not self._is_due_sorted): self._sort_due()
+            _return = self._due[next(iter(self._due))][TimingWheel.ENTRY_TIMESTAMP]
+        elif (len(self._entries) > 0):
+            bits = TimingWheel.LEVEL_BITS[0]
+            mask = (1 << bits) - 1
+
+            tick = self._tick
+            tick_cascade = ((tick + mask) >> bits) << bits
+
+            if (self._level_counts[0] > 0):
+                while (tick < tick_cascade and len(self._levels[0][tick & mask]) < 1): tick += 1
+            else: tick = self._get_cascade_tick(tick)
+
+            _return = tick * self.resolution
+        #
+
+        return _return
+    #
+
+    def add(self, tid, timestamp, task):
+        """
+Schedules the given task for activation at the given UNIX timestamp. A task
+already scheduled with the same TID is replaced.
+
+:param tid: Task ID
+:param timestamp: UNIX timestamp
+:param task: Task definition
+
+:return: (bool) True if the task is the next one to be activated
+:since:  v1.0.0
+        """
+
+        if (tid in self._entries): self.remove(tid)
+        is_empty = (len(self._entries) < 1)
+
+        entry = [ self._get_tick(timestamp), timestamp, task, tid, None, -1 ]
+        self._entries[tid] = entry
+        self._place(entry)
+
+        return (is_empty or entry[TimingWheel.ENTRY_LEVEL] < 1)
+    #
+
+    def _advance(self, tick, limit):
+        """
+Processes all ticks up to the given one and moves entries reaching their
+activation tick to the due ones.
+
+:param tick: Last tick to be processed
+:param limit: Stop processing if the given number of entries are due; 0
+              for no limit
+
+:since: v1.0.0
+        """
+
+        bits = TimingWheel.LEVEL_BITS[0]
+        mask = (1 << bits) - 1
+
+        while (self._tick <= tick and (limit < 1 or len(self._due) < limit)):
+            if (len(self._entries) == len(self._due)):
+                self._tick = 1 + tick
+                break
+            #
+
+            if ((self._tick & mask) == 0): self._cascade()
+
+            if (self._level_counts[0] < 1):
+                cascade_tick = self._get_cascade_tick(1 + self._tick)
+                self._tick = (1 + tick if (cascade_tick < 0) else min(1 + tick, cascade_tick))
+            else:
+                slot = self._levels[0][self._tick & mask]
+
+                if (len(slot) > 0):
+                    entries = sorted(slot.values(), key = lambda entry: entry[TimingWheel.ENTRY_TIMESTAMP])
+
+                    slot.clear()
+                    self._level_counts[0] -= len(entries)
+
+                    for entry in entries:
+                        entry[TimingWheel.ENTRY_LEVEL] = -1
+                        entry[TimingWheel.ENTRY_SLOT] = self._due
+                        self._due[entry[TimingWheel.ENTRY_TID]] = entry
+                    #
+                #
+
+                self._tick += 1
+            #
+        #
+    #
+
+    def _cascade(self):
+        """
+Moves entries of the higher wheel levels reaching the current tick to lower
+ones.
+
+:since: v1.0.0
+        """
+
+        shift = TimingWheel.LEVEL_BITS[0]
+
+        for level in range(1, len(TimingWheel.LEVEL_BITS)):
+            bits = TimingWheel.LEVEL_BITS[level]
+            index = (self._tick >> shift) & ((1 << bits) - 1)
+            slot = self._levels[level][index]
+
+            if (len(slot) > 0):
+                entries = list(slot.values())
+
+                slot.clear()
+                self._level_counts[level] -= len(entries)
+
+                for entry in entries: self._place(entry)
+            #
+
+            if (index != 0): break
+            shift += bits
+        #
+    #
+
+    def get(self, tid):
+        """
+Returns the task for the given TID.
+
+:param tid: Task ID
+
+:return: (dict) Task definition; None if not scheduled
+:since:  v1.0.0
+        """
+
+        entry = self._entries.get(tid)
+        return (None if (entry is None) else entry[TimingWheel.ENTRY_TASK])
+    #
+
+    def _get_cascade_tick(self, tick):
+        """
+Returns the first tick not before the given one an occupied slot of a
+higher wheel level is cascaded at. Ticks cascading empty slots only are
+skipped this way.
+
+:param tick: First tick to be considered
+
+:return: (int) Tick; -1 if higher wheel levels are empty
+:since:  v1.0.0
+        """
+
+        _return = -1
+        shift = TimingWheel.LEVEL_BITS[0]
+
+        for level in range(1, len(TimingWheel.LEVEL_BITS)):
+            bits = TimingWheel.LEVEL_BITS[level]
+
+            if (self._level_counts[level] > 0):
+                block = (tick + (1 << shift) - 1) >> shift
+                mask = (1 << bits) - 1
+
+                for index, slot in enumerate(self._levels[level]):
+                    if (len(slot) > 0):
+                        cascade_tick = (block + ((index - block) & mask)) << shift
+                        if (_return < 0 or cascade_tick < _return): _return = cascade_tick
+                    #
+                #
+            #
+
+            shift += bits
+        #
+
+        return _return
+    #
+
+    def _get_tick(self, timestamp):
+        """
+Returns the first tick not before the given UNIX timestamp.
+
+:param timestamp: UNIX timestamp
+
+:return: (int) Tick
+:since:  v1.0.0
+        """
+
+        _return = int(timestamp / self.resolution)
+        if (_return * self.resolution < timestamp): _return += 1
+
+        return _return
+    #
+
+    def _place(self, entry):
+        """
+Places the given entry in the wheel level slot matching its activation
+tick.
+
+:param entry: Wheel entry
+
+:since: v1.0.0
+        """
+
+        tick = entry[TimingWheel.ENTRY_TICK]
+
+        if (tick < self._tick):
+            if (len(self._due) > 0): self._is_due_sorted = False
+
+            entry[TimingWheel.ENTRY_LEVEL] = -1
+            entry[TimingWheel.ENTRY_SLOT] = self._due
+
+            self._due[entry[TimingWheel.ENTRY_TID]] = entry
+        else:
+            delta = tick - self._tick
+
+            level = 0
+            levels_count = len(TimingWheel.LEVEL_BITS)
+            shift = 0
+
+            while (level < levels_count):
+                bits = TimingWheel.LEVEL_BITS[level]
+                span = 1 << (shift + bits)
+
+                if (delta < span or level + 1 == levels_count):
+                    # Entries beyond the wheel span are placed in the last slot reachable and are moved again on cascade
+                    if (delta >= span): tick = self._tick + span - 1
+
+                    slot = self._levels[level][(tick >> shift) & ((1 << bits) - 1)]
+                    break
+                #
+
+                level += 1
+                shift += bits
+            #
+
+            entry[TimingWheel.ENTRY_LEVEL] = level
+            entry[TimingWheel.ENTRY_SLOT] = slot
+
+            slot[entry[TimingWheel.ENTRY_TID]] = entry
+            self._level_counts[level] += 1
+        #
+    #
+
+    def pop_due(self, timestamp, limit = 0):
+        """
+Removes and returns all tasks due at the given UNIX timestamp in the order
+of activation.
+
+:param timestamp: UNIX timestamp
+:param limit: Maximum number of tasks returned; 0 for no limit
+
+:return: (list) Task definitions
+:since:  v1.0.0
+        """
+
+        _return = [ ]
+
+        tick = int(timestamp / self.resolution)
+        if ((tick + 1) * self.resolution <= timestamp): tick += 1
+
+        self._advance(tick, limit)
+        if (not self._is_due_sorted): self._sort_due()
+
+        while (len(self._due) > 0 and (limit < 1 or len(_return) < limit)):
+            tid = next(iter(self._due))
+
+            del(self._due[tid])
+            entry = self._entries.pop(tid)
+
+            _return.append(entry[TimingWheel.ENTRY_TASK])
+        #
+
+        return _return
+    #
+
+    def _sort_due(self):
+        """
+Sorts the due entries by their UNIX timestamp. Entries with the same UNIX
+timestamp keep their order.
+
+:since: v1.0.0
+        """
+
+        entries = sorted(self._due.values(), key = lambda entry: entry[TimingWheel.ENTRY_TIMESTAMP])
+
+        # Entries reference the dict of due ones as their slot
+        self._due.clear()
+        for entry in entries: self._due[entry[TimingWheel.ENTRY_TID]] = entry
+
+        self._is_due_sorted = True
+    #
+
+    def reschedule(self, tid, timestamp):
+        """
+Moves the scheduled task with the given TID to the given UNIX timestamp.
+
+:param tid: Task ID
+:param timestamp: UNIX timestamp
+
+:return: (bool) True if the task is the next one to be activated
+:since:  v1.0.0
+        """
+
+        entry = self._entries[tid]
+
+        del(entry[TimingWheel.ENTRY_SLOT][tid])
+        if (entry[TimingWheel.ENTRY_LEVEL] > -1): self._level_counts[entry[TimingWheel.ENTRY_LEVEL]] -= 1
+
+        entry[TimingWheel.ENTRY_TICK] = self._get_tick(timestamp)
+        entry[TimingWheel.ENTRY_TIMESTAMP] = timestamp
+        self._place(entry)
+
+        return (entry[TimingWheel.ENTRY_LEVEL] < 1)
+    #
+
+    def remove(self, tid):
+        """
+Removes the task with the given TID.
+
+:param tid: Task ID
+
+:return: (bool) True on success
+:since:  v1.0.0
+        """
+
+        entry = self._entries.pop(tid, None)
+        _return = (entry is not None)
+
+        if (_return):
+            del(entry[TimingWheel.ENTRY_SLOT][tid])
+            if (entry[TimingWheel.ENTRY_LEVEL] > -1): self._level_counts[entry[TimingWheel.ENTRY_LEVEL]] -= 1
+        #
+
+        return _return
+    #
+#
@@ -34,4 +34,6 @@ from .abstract import Abstract
 from .abstract_hook import AbstractHook
 from .abstract_lrt_hook import AbstractLrtHook
 from .callback import Callback
+from .lrt_executor import LrtExecutor
+from .lrt_process_pool import LrtProcessPool
 from .persistent_lrt_hook import PersistentLrtHook
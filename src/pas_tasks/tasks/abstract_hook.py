@@ -32,7 +32,8 @@ https://www.direct-netware.de/redirect?licenses;gpl
 
 from dpt_runtime.exception_log_trap import ExceptionLogTrap
 from dpt_runtime.not_implemented_exception import NotImplementedException
-from dpt_threading.thread import Thread
+
+from ..worker_pool import WorkerPool
 
 class AbstractHook(object):
     """
@@ -82,10 +83,10 @@ Hook execution
         """
 Starts the execution of this hook asynchronously.
 
-:since: v1.0.0
+:return: (bool) True if the hook execution has been started or queued
+:since:  v1.0.0
         """
 
-        thread = Thread(target = self.run, args = ( task_store, _tid ), kwargs = kwargs)
-        thread.start()
+        return WorkerPool.get_instance().submit(self.run, ( task_store, _tid ), kwargs)
     #
 #
@@ -30,16 +30,12 @@ https://www.direct-netware.de/redirect?licenses;gpl
 #echo(__FILEPATH__)#
 """
 
-from collections import deque
-
 from dpt_module_loader import NamedClassLoader
-from dpt_runtime.exception_log_trap import ExceptionLogTrap
 from dpt_runtime.not_implemented_exception import NotImplementedException
 from dpt_settings import Settings
-from dpt_threading.thread import Thread
-from dpt_threading.thread_lock import ThreadLock
 
 from .abstract_hook import AbstractHook
+from .lrt_executor import LrtExecutor
 
 class AbstractLrtHook(AbstractHook):
     """
@@ -62,18 +58,6 @@ amount should run parallel.
 python.org: __slots__ reserves space for the declared variables and prevents
 the automatic creation of __dict__ and __weakref__ for each instance.
     """
-    _context_limit = 0
-    """
-Limit for allowed context executions
-    """
-    _context_queues = { }
-    """
-Currently active context queues
-    """
-    _lock = ThreadLock()
-    """
-Thread safety lock
-    """
 
     def __init__(self):
         """
@@ -137,47 +121,14 @@ Returns the delay value for rescheduling.
 :since:  v1.0.0
         """
 
-        _return = self.min_retry_delay
-
-        with AbstractLrtHook._lock:
-            multiplier = 1
-
-            for context_name in AbstractLrtHook._context_queues:
-                multiplier += len(AbstractLrtHook._context_queues[context_name])
-            #
-
-            _return *= (multiplier / AbstractLrtHook._context_limit)
-        #
+        lrt_executor = LrtExecutor.get_instance()
+        _return = self.min_retry_delay * ((1 + lrt_executor.queued_count) / lrt_executor.size)
 
         if (_return > self.max_retry_delay): _return = self.max_retry_delay
 
         return _return
     #
 
-    def _get_task_or_finish(self):
-        """
-Returns the next task from the context queue if any. Otherwise finish the
-execution.
-
-:return: (mixed) Task from the same context queue; None otherwise
-:since:  v1.0.0
-        """
-
-        with AbstractLrtHook._lock:
-            _return = (AbstractLrtHook._context_queues[self.context_id].popleft()
-                       if (len(AbstractLrtHook._context_queues[self.context_id]) > 0) else
-                       None
-                      )
-
-            if (_return is None):
-                del(AbstractLrtHook._context_queues[self.context_id])
-                if (self._log_handler is not None): self._log_handler.debug("{0!r} finished context '{1}'", self, self.context_id, context = "pas_tasks")
-            #
-        #
-
-        return _return
-    #
-
     def run(self, task_store, _tid, **kwargs):
         """
 Starts the execution of this hook synchronously.
@@ -189,26 +140,6 @@ Starts the execution of this hook synchronously.
         raise NotImplementedException()
     #
 
-    def _run(self):
-        """
-Returns the manager instance responsible for this hook.
-
-:return: (object) Hook manager on success
-:since:  v1.0.0
-        """
-
-        # pylint: disable=protected-access
-
-        task = self._get_task_or_finish()
-
-        while (task is not None):
-            if (self._log_handler is not None): self._log_handler.debug("{0!r} is executing tasks with context '{1}'", self, self.context_id, context = "pas_tasks")
-            with ExceptionLogTrap("pas_tasks"): task._run_hook()
-
-            task = self._get_task_or_finish()
-        #
-    #
-
     def _run_hook(self):
         """
 Hook execution
@@ -222,40 +153,19 @@ Hook execution
 
     def start(self, task_store, _tid, **kwargs):
         """
-Starts the execution of this hook asynchronously.
+Starts the execution of this hook asynchronously. The hook is rescheduled
+if the LRT executor does not accept it.
 
-:since: v1.0.0
+:return: (bool) True as the hook has been queued or rescheduled
+:since:  v1.0.0
         """
 
-        is_active = False
-        is_queued = False
-
         if (self.params is None): self._params = kwargs
 
-        with AbstractLrtHook._lock:
-            if (AbstractLrtHook._context_limit < 1): AbstractLrtHook._context_limit = Settings.get("pas_tasks_lrt_limit", 1)
-
-            if (self.context_id in AbstractLrtHook._context_queues):
-                if (not self.independent_scheduling):
-                    AbstractLrtHook._context_queues[self.context_id].append(self)
-                    if (self._log_handler is not None): self._log_handler.debug("{0!r} queued with context '{1}'", self, self.context_id, context = "pas_tasks")
-
-                    is_active = True
-                    is_queued = True
-                #
-            elif (len(AbstractLrtHook._context_queues) < AbstractLrtHook._context_limit):
-                AbstractLrtHook._context_queues[self.context_id] = deque()
-                AbstractLrtHook._context_queues[self.context_id].append(self)
-                if (self._log_handler is not None): self._log_handler.debug("{0!r} initialized in context '{1}'", self, self.context_id, context = "pas_tasks")
-
-                is_queued = True
-            #
-        #
-
-        if (not is_queued): task_store.add(_tid, self, self._queue_delay)
-        elif (not is_active):
-            thread = Thread(target = self._run)
-            thread.start()
-        #
+        if (LrtExecutor.get_instance().submit(self.context_id, self, self.independent_scheduling)):
+            if (self._log_handler is not None): self._log_handler.debug("{0!r} queued with context '{1}'", self, self.context_id, context = "pas_tasks")
+        else: task_store.add(_tid, self, self._queue_delay)
+
+        return True
     #
 #
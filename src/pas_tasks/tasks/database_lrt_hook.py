@@ -49,12 +49,27 @@ A "DatabaseLrtHook" is a database backed persistent, long running task.
              GNU General Public License 2 or later
     """
 
-    __slots__ = [ ]
+    __slots__ = [ "task" ]
     """
 python.org: __slots__ reserves space for the declared variables and prevents
 the automatic creation of __dict__ and __weakref__ for each instance.
     """
 
+    def __init__(self, hook, **kwargs):
+        """
+Constructor __init__(DatabaseLrtHook)
+
+:since: v1.0.0
+        """
+
+        PersistentLrtHook.__init__(self, hook, **kwargs)
+
+        self.task = None
+        """
+Database task this hook has been loaded from
+        """
+    #
+
     def _run_hook(self):
         """
 Hook execution
@@ -62,10 +77,10 @@ Hook execution
 :since: v1.0.0
         """
 
-        task = None
+        task = self.task
         tid = self.params.get("_tid")
 
-        if (tid is not None):
+        if (task is None and tid is not None):
             try: task = Task.load_tid(tid)
             except NothingMatchedException: pass
         #
@@ -74,7 +89,9 @@ Hook execution
             if (self._log_handler is not None): self._log_handler.warning("{0!r} is executed without a database task entry", self, context = "pas_tasks")
             PersistentLrtHook._run_hook(self)
         else:
-            with DatabaseTaskContext(task): PersistentLrtHook._run_hook(self)
+            with DatabaseTaskContext(task) as is_running:
+                if (is_running): PersistentLrtHook._run_hook(self)
+            #
         #
     #
 #
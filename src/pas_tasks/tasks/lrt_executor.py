@@ -0,0 +1,449 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;tasks
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasTasksVersion)#
+#echo(__FILEPATH__)#
+"""
+
+from collections import deque
+from threading import Condition
+from weakref import ref
+
+from dpt_module_loader import NamedClassLoader
+from dpt_runtime.exception_log_trap import ExceptionLogTrap
+from dpt_runtime.value_exception import ValueException
+from dpt_settings import Settings
+from dpt_threading.instance_lock import InstanceLock
+from dpt_threading.thread import Thread
+
+class LrtExecutor(object):
+    """
+The "LrtExecutor" runs long running tasks (LRT) with a fixed number of
+worker threads. Tasks are queued per context and contexts take turns in a
+weighted round-robin order. A context executes as many tasks per turn as
+its weight and no more tasks in parallel than its limit.
+
+Independently scheduled tasks of an active context are held in a bounded
+admission queue and admitted as soon as the context has a free slot. Other
+tasks are held in a bounded queue per context.
+
+:author:     direct Netware Group et al.
+:copyright:  direct Netware Group - All rights reserved
+:package:    pas
+:subpackage: tasks
+:since:      v1.0.0
+:license:    https://www.direct-netware.de/redirect?licenses;gpl
+             GNU General Public License 2 or later
+    """
+
+    CONTEXT_QUEUE = 0
+    """
+Context entry position of the queue of waiting tasks
+    """
+    CONTEXT_RUNNING = 1
+    """
+Context entry position of the number of tasks being executed
+    """
+    CONTEXT_LIMIT = 2
+    """
+Context entry position of the maximum number of tasks executed in parallel
+    """
+    CONTEXT_WEIGHT = 3
+    """
+Context entry position of the number of tasks executed per turn
+    """
+    CONTEXT_TURN_COUNT = 4
+    """
+Context entry position of the number of tasks executed in the current turn
+    """
+    CONTEXT_IS_READY = 5
+    """
+Context entry position of the flag set if the context is queued for a turn
+    """
+
+    __slots__ = [ "__weakref__",
+                  "_admission_count",
+                  "_admission_queues",
+                  "admission_queue_size",
+                  "_condition",
+                  "context_limits",
+                  "context_queue_size",
+                  "context_weights",
+                  "_contexts",
+                  "_is_started",
+                  "_log_handler",
+                  "_ready_contexts",
+                  "size",
+                  "_workers_count"
+                ]
+    """
+python.org: __slots__ reserves space for the declared variables and prevents
+the automatic creation of __dict__ and __weakref__ for each instance.
+    """
+    _instance_lock = InstanceLock()
+    """
+Thread safety lock
+    """
+    _weakref_instance = None
+    """
+LrtExecutor weakref instance
+    """
+
+    def __init__(self, size = None):
+        """
+Constructor __init__(LrtExecutor)
+
+:param size: Number of worker threads; None to use the configured value
+
+:since: v1.0.0
+        """
+
+        if (size is None): size = int(Settings.get("pas_tasks_lrt_limit", 1))
+        if (size < 1): raise ValueException("LRT executor size given is invalid")
+
+        self._admission_count = 0
+        """
+Number of tasks waiting for admission
+        """
+        self._admission_queues = { }
+        """
+Queues of independently scheduled tasks waiting for admission indexed by
+context ID
+        """
+        self.admission_queue_size = int(Settings.get("pas_tasks_lrt_admission_queue_size", 1024))
+        """
+Maximum number of tasks waiting for admission; 0 for an unbounded queue
+        """
+        self._condition = Condition()
+        """
+Condition used to notify waiting workers
+        """
+        self.context_limits = Settings.get("pas_tasks_lrt_context_limits", { })
+        """
+Maximum number of tasks executed in parallel indexed by context ID
+        """
+        self.context_queue_size = int(Settings.get("pas_tasks_lrt_context_queue_size", 1024))
+        """
+Maximum number of tasks waiting for execution per context; 0 for an
+unbounded queue
+        """
+        self.context_weights = Settings.get("pas_tasks_lrt_context_weights", { })
+        """
+Number of tasks executed per turn indexed by context ID
+        """
+        self._contexts = { }
+        """
+Context entries of [ queue, running, limit, weight, turn count, is ready ]
+indexed by context ID
+        """
+        self._is_started = False
+        """
+True if workers have been started
+        """
+        self._log_handler = NamedClassLoader.get_singleton("dpt_logging.LogHandler", False)
+        """
+The LogHandler is called whenever debug messages should be logged or errors
+happened.
+        """
+        self._ready_contexts = deque()
+        """
+Round-robin queue of context IDs with tasks ready for execution
+        """
+        self.size = size
+        """
+Number of worker threads
+        """
+        self._workers_count = 0
+        """
+Number of running worker threads
+        """
+    #
+
+    @property
+    def queued_count(self):
+        """
+Returns the number of tasks waiting for execution.
+
+:return: (int) Number of queued tasks
+:since:  v1.0.0
+        """
+
+        with self._condition:
+            _return = self._admission_count
+            _return += sum(len(context[LrtExecutor.CONTEXT_QUEUE]) for context in self._contexts.values())
+        #
+
+        return _return
+    #
+
+    def _admit(self, context_id, context):
+        """
+Moves tasks waiting for admission to the context queue while the context
+limit is not reached. The lock must be held.
+
+:param context_id: Context ID
+:param context: Context entry
+
+:since: v1.0.0
+        """
+
+        admission_queue = self._admission_queues.get(context_id)
+
+        if (admission_queue is not None):
+            while (len(admission_queue) > 0
+                   and (context[LrtExecutor.CONTEXT_RUNNING] + len(context[LrtExecutor.CONTEXT_QUEUE])) < context[LrtExecutor.CONTEXT_LIMIT]
+                  ):
+                context[LrtExecutor.CONTEXT_QUEUE].append(admission_queue.popleft())
+                self._admission_count -= 1
+            #
+
+            if (len(admission_queue) < 1): del(self._admission_queues[context_id])
+        #
+    #
+
+    def _get_context(self, context_id):
+        """
+Returns the context entry for the given context ID. A new one is created
+if the context is not active. The lock must be held.
+
+:param context_id: Context ID
+
+:return: (list) Context entry
+:since:  v1.0.0
+        """
+
+        _return = self._contexts.get(context_id)
+
+        if (_return is None):
+            _return = [ deque(),
+                        0,
+                        max(1, int(self.context_limits.get(context_id, 1))),
+                        max(1, int(self.context_weights.get(context_id, 1))),
+                        0,
+                        False
+                      ]
+
+            self._contexts[context_id] = _return
+            if (self._log_handler is not None): self._log_handler.debug("{0!r} initialized context '{1}'", self, context_id, context = "pas_tasks")
+        #
+
+        return _return
+    #
+
+    def is_context_active(self, context_id):
+        """
+Returns true if tasks of the given context are queued or executed.
+
+:param context_id: Context ID
+
+:return: (bool) True if active
+:since:  v1.0.0
+        """
+
+        with self._condition: return (context_id in self._contexts)
+    #
+
+    def _run_worker(self):
+        """
+Worker thread loop executing one task of the next ready context at a time.
+
+:since: v1.0.0
+        """
+
+        # pylint: disable=protected-access
+
+        while (True):
+            with self._condition:
+                while (self._is_started and len(self._ready_contexts) < 1): self._condition.wait()
+
+                if (len(self._ready_contexts) < 1):
+                    self._workers_count -= 1
+                    break
+                #
+
+                context_id = self._ready_contexts.popleft()
+                context = self._contexts[context_id]
+                context[LrtExecutor.CONTEXT_IS_READY] = False
+
+                task = context[LrtExecutor.CONTEXT_QUEUE].popleft()
+                context[LrtExecutor.CONTEXT_RUNNING] += 1
+                context[LrtExecutor.CONTEXT_TURN_COUNT] += 1
+
+                if (context[LrtExecutor.CONTEXT_TURN_COUNT] >= context[LrtExecutor.CONTEXT_WEIGHT]): context[LrtExecutor.CONTEXT_TURN_COUNT] = 0
+                self._schedule(context_id, context, (context[LrtExecutor.CONTEXT_TURN_COUNT] > 0))
+            #
+
+            if (self._log_handler is not None): self._log_handler.debug("{0!r} is executing a task with context '{1}'", self, context_id, context = "pas_tasks")
+            with ExceptionLogTrap("pas_tasks"): task._run_hook()
+
+            with self._condition:
+                context[LrtExecutor.CONTEXT_RUNNING] -= 1
+                self._admit(context_id, context)
+
+                if (len(context[LrtExecutor.CONTEXT_QUEUE]) > 0): self._schedule(context_id, context, (context[LrtExecutor.CONTEXT_TURN_COUNT] > 0))
+                elif (context[LrtExecutor.CONTEXT_RUNNING] < 1):
+                    del(self._contexts[context_id])
+                    if (self._log_handler is not None): self._log_handler.debug("{0!r} finished context '{1}'", self, context_id, context = "pas_tasks")
+                #
+            #
+        #
+    #
+
+    def _schedule(self, context_id, context, is_turn_continued = False):
+        """
+Queues the given context for a turn if it has waiting tasks and its limit
+is not reached. The lock must be held.
+
+:param context_id: Context ID
+:param context: Context entry
+:param is_turn_continued: True to continue the current turn of the context
+
+:since: v1.0.0
+        """
+
+        if ((not context[LrtExecutor.CONTEXT_IS_READY])
+            and len(context[LrtExecutor.CONTEXT_QUEUE]) > 0
+            and context[LrtExecutor.CONTEXT_RUNNING] < context[LrtExecutor.CONTEXT_LIMIT]
+           ):
+            context[LrtExecutor.CONTEXT_IS_READY] = True
+
+            if (is_turn_continued): self._ready_contexts.appendleft(context_id)
+            else: self._ready_contexts.append(context_id)
+
+            self._condition.notify()
+        #
+    #
+
+    def start(self):
+        """
+Starts the worker threads.
+
+:since: v1.0.0
+        """
+
+        with self._condition:
+            if (not self._is_started):
+                self._is_started = True
+
+                for _ in range(self._workers_count, self.size):
+                    thread = Thread(target = self._run_worker)
+                    thread.daemon = True
+                    thread.start()
+
+                    self._workers_count += 1
+                #
+            #
+        #
+    #
+
+    def stop(self):
+        """
+Stops the worker threads after all queued tasks have been executed.
+
+:since: v1.0.0
+        """
+
+        with self._condition:
+            if (self._is_started):
+                self._is_started = False
+                self._condition.notify_all()
+            #
+        #
+    #
+
+    def submit(self, context_id, task, is_independent = False):
+        """
+Queues the given task for execution within the given context. An
+independently scheduled task of an active context is queued for admission
+until the context has a free slot.
+
+:param context_id: Context ID
+:param task: LRT hook instance
+:param is_independent: True to schedule the task independently of other
+                       tasks of the same context
+
+:return: (bool) True if queued; False if the admission queue or the
+         context queue is full
+:since:  v1.0.0
+        """
+
+        if (not self._is_started): self.start()
+
+        with self._condition:
+            context = self._contexts.get(context_id)
+            _return = True
+
+            if (context is not None and is_independent):
+                if (self.admission_queue_size > 0 and self._admission_count >= self.admission_queue_size): _return = False
+                else:
+                    if (context_id not in self._admission_queues): self._admission_queues[context_id] = deque()
+
+                    self._admission_queues[context_id].append(task)
+                    self._admission_count += 1
+
+                    self._admit(context_id, context)
+                    self._schedule(context_id, context)
+                #
+            elif (context is not None
+                  and self.context_queue_size > 0
+                  and len(context[LrtExecutor.CONTEXT_QUEUE]) >= self.context_queue_size
+                 ): _return = False
+            else:
+                context = self._get_context(context_id)
+                context[LrtExecutor.CONTEXT_QUEUE].append(task)
+
+                self._schedule(context_id, context)
+            #
+        #
+
+        return _return
+    #
+
+    @staticmethod
+    def get_instance():
+        """
+Get the LrtExecutor singleton.
+
+:return: (LrtExecutor) Object on success
+:since:  v1.0.0
+        """
+
+        _return = None
+
+        with LrtExecutor._instance_lock:
+            if (LrtExecutor._weakref_instance is not None): _return = LrtExecutor._weakref_instance()
+
+            if (_return is None):
+                _return = LrtExecutor()
+                LrtExecutor._weakref_instance = ref(_return)
+            #
+        #
+
+        return _return
+    #
+#
@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;tasks
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasTasksVersion)#
+#echo(__FILEPATH__)#
+"""
+
+from multiprocessing import get_context
+from os import cpu_count
+from weakref import ref
+
+from dpt_plugins import Hook
+from dpt_settings import Settings
+from dpt_threading.instance_lock import InstanceLock
+
+def _init_process(path_data, plugins):
+    """
+Initializes a worker process by reading the tasks daemon settings and
+loading the given plugins.
+
+:param path_data: Data path of the tasks daemon
+:param plugins: List of plugin names to be loaded
+
+:since: v1.0.0
+    """
+
+    if (path_data is not None):
+        Settings.set("path_data", path_data)
+
+        Settings.read_file("{0}/settings/core.json".format(path_data))
+        Settings.read_file("{0}/settings/pas_tasks_daemon.json".format(path_data))
+    #
+
+    for plugin in plugins: Hook.load(plugin)
+#
+
+def _run_hook(hook, params):
+    """
+Calls the given hook in a worker process.
+
+:param hook: Hook to be called
+:param params: Hook parameters
+
+:return: (mixed) Hook result
+:since:  v1.0.0
+    """
+
+    return Hook.call_one(hook, **params)
+#
+
+class LrtProcessPool(object):
+    """
+The "LrtProcessPool" executes CPU intensive long running tasks (LRT) in
+worker processes to keep them from blocking the tasks daemon. Workers load
+the configured plugins on start and are replaced after a configured number
+of tasks.
+
+:author:     direct Netware Group et al.
+:copyright:  direct Netware Group - All rights reserved
+:package:    pas
+:subpackage: tasks
+:since:      v1.0.0
+:license:    https://www.direct-netware.de/redirect?licenses;gpl
+             GNU General Public License 2 or later
+    """
+
+    __slots__ = [ "__weakref__", "hooks", "_pool" ]
+    """
+python.org: __slots__ reserves space for the declared variables and prevents
+the automatic creation of __dict__ and __weakref__ for each instance.
+    """
+    _instance_lock = InstanceLock()
+    """
+Thread safety lock
+    """
+    _is_stopped = False
+    """
+True if worker processes have been stopped. Hooks are called in the current
+process afterwards.
+    """
+    _weakref_instance = None
+    """
+LrtProcessPool weakref instance
+    """
+
+    def __init__(self):
+        """
+Constructor __init__(LrtProcessPool)
+
+:since: v1.0.0
+        """
+
+        self.hooks = set(Settings.get("pas_tasks_lrt_process_pool_hooks", [ ]))
+        """
+Hooks executed in worker processes
+        """
+        self._pool = None
+        """
+Process pool of workers
+        """
+    #
+
+    def call(self, hook, **kwargs):
+        """
+Calls the given hook in a worker process and waits for the result. The
+hook is called in the current process if the pool has been stopped.
+
+:param hook: Hook to be called
+
+:return: (mixed) Hook result
+:since:  v1.0.0
+        """
+
+        with LrtProcessPool._instance_lock:
+            if (self._pool is None and (not LrtProcessPool._is_stopped)):
+                size = int(Settings.get("pas_tasks_lrt_process_pool_size", cpu_count()))
+                max_tasks_per_child = int(Settings.get("pas_tasks_lrt_process_pool_max_tasks_per_child", 100))
+
+                context = get_context(Settings.get("pas_tasks_lrt_process_pool_start_method", "spawn"))
+
+                self._pool = context.Pool(size,
+                                          _init_process,
+                                          ( Settings.get("path_data"), Settings.get("pas_tasks_lrt_process_pool_plugins", [ "tasks" ]) ),
+                                          (max_tasks_per_child if (max_tasks_per_child > 0) else None)
+                                         )
+            #
+
+            pool = self._pool
+        #
+
+        return (_run_hook(hook, kwargs) if (pool is None) else pool.apply(_run_hook, ( hook, kwargs )))
+    #
+
+    def is_hook_supported(self, hook):
+        """
+Returns true if the given hook is configured to be executed in worker
+processes.
+
+:param hook: Hook to be called
+
+:return: (bool) True if supported
+:since:  v1.0.0
+        """
+
+        return ((not LrtProcessPool._is_stopped) and hook in self.hooks)
+    #
+
+    def start(self):
+        """
+Allows worker processes to be started on demand again.
+
+:since: v1.0.0
+        """
+
+        with LrtProcessPool._instance_lock: LrtProcessPool._is_stopped = False
+    #
+
+    def stop(self):
+        """
+Stops all worker processes after pending tasks have been executed. Worker
+processes are not started again until "start()" is called.
+
+:since: v1.0.0
+        """
+
+        with LrtProcessPool._instance_lock:
+            LrtProcessPool._is_stopped = True
+
+            pool = self._pool
+            self._pool = None
+        #
+
+        if (pool is not None):
+            pool.close()
+            pool.join()
+        #
+    #
+
+    @staticmethod
+    def get_instance():
+        """
+Get the LrtProcessPool singleton.
+
+:return: (LrtProcessPool) Object on success
+:since:  v1.0.0
+        """
+
+        _return = None
+
+        with LrtProcessPool._instance_lock:
+            if (LrtProcessPool._weakref_instance is not None): _return = LrtProcessPool._weakref_instance()
+
+            if (_return is None):
+                _return = LrtProcessPool()
+                LrtProcessPool._weakref_instance = ref(_return)
+            #
+        #
+
+        return _return
+    #
+#
@@ -33,6 +33,7 @@ https://www.direct-netware.de/redirect?licenses;gpl
 from dpt_plugins import Hook
 
 from .abstract_lrt_hook import AbstractLrtHook
+from .lrt_process_pool import LrtProcessPool
 
 class PersistentLrtHook(AbstractLrtHook):
     """
@@ -98,11 +99,15 @@ Returns the hook being called of this long running task instance.
 
     def _run_hook(self):
         """
-Hook execution
+Hook execution. Hooks configured for the LRT process pool are executed in a
+worker process.
 
 :since: v1.0.0
         """
 
-        Hook.call_one(self.underlying_hook, **self.params)
+        lrt_process_pool = LrtProcessPool.get_instance()
+
+        if (lrt_process_pool.is_hook_supported(self.underlying_hook)): lrt_process_pool.call(self.underlying_hook, **self.params)
+        else: Hook.call_one(self.underlying_hook, **self.params)
     #
 #
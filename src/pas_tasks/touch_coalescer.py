@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;tasks
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasTasksVersion)#
+#echo(__FILEPATH__)#
+"""
+
+from collections import deque
+from threading import Condition
+from time import time
+
+from dpt_module_loader import NamedClassLoader
+from dpt_threading.thread import Thread
+
+class TouchCoalescer(object):
+    """
+A "TouchCoalescer" merges repeated "reregister_timeout()" touches of the
+same TID. The first touch is sent immediately while repeated ones within
+the coalescing window are sent once at the end of the window.
+
+:author:     direct Netware Group et al.
+:copyright:  direct Netware Group - All rights reserved
+:package:    pas
+:subpackage: tasks
+:since:      v1.0.0
+:license:    https://www.direct-netware.de/redirect?licenses;gpl
+             GNU General Public License 2 or later
+    """
+
+    # pylint: disable=broad-except
+
+    TOUCH_WINDOW_END = 0
+    """
+Touch entry position of the UNIX timestamp the coalescing window ends
+    """
+    TOUCH_IS_PENDING = 1
+    """
+Touch entry position of the flag set if a touch has been coalesced
+    """
+
+    __slots__ = [ "client_pool",
+                  "_condition",
+                  "_is_started",
+                  "_log_handler",
+                  "outbox",
+                  "_touches",
+                  "_windows",
+                  "window"
+                ]
+    """
+python.org: __slots__ reserves space for the declared variables and prevents
+the automatic creation of __dict__ and __weakref__ for each instance.
+    """
+
+    def __init__(self, client_pool, window, outbox = None):
+        """
+Constructor __init__(TouchCoalescer)
+
+:param client_pool: Bus client pool used to send touches
+:param window: Coalescing window in seconds
+:param outbox: Outbox used to send touches in one-way mode
+
+:since: v1.0.0
+        """
+
+        self.client_pool = client_pool
+        """
+Bus client pool used to send touches
+        """
+        self._condition = Condition()
+        """
+Condition used to notify the flushing thread
+        """
+        self._is_started = False
+        """
+True if the flushing thread has been started
+        """
+        self._log_handler = NamedClassLoader.get_singleton("dpt_logging.LogHandler", False)
+        """
+The LogHandler is called whenever debug messages should be logged or errors
+happened.
+        """
+        self.outbox = outbox
+        """
+Outbox used to send touches in one-way mode
+        """
+        self._touches = { }
+        """
+Touch entries of [ window end, is pending ] indexed by TID
+        """
+        self._windows = deque()
+        """
+Queue of ( window end, TID ) ordered by the window end
+        """
+        self.window = window
+        """
+Coalescing window in seconds
+        """
+    #
+
+    def discard(self, tid):
+        """
+Discards the coalescing window and a pending touch of the given TID.
+
+:param tid: Task ID
+
+:since: v1.0.0
+        """
+
+        with self._condition: self._touches.pop(tid, None)
+    #
+
+    def flush(self, is_forced = False):
+        """
+Sends all pending touches of ended coalescing windows with one request.
+A new window is opened for each TID sent.
+
+:param is_forced: True to send pending touches of all windows
+
+:since: v1.0.0
+        """
+
+        tids = [ ]
+
+        with self._condition:
+            timestamp = time()
+
+            while (len(self._windows) > 0 and (is_forced or self._windows[0][0] <= timestamp)):
+                window_end, tid = self._windows.popleft()
+                touch = self._touches.get(tid)
+
+                if (touch is not None and touch[TouchCoalescer.TOUCH_WINDOW_END] == window_end):
+                    if (touch[TouchCoalescer.TOUCH_IS_PENDING]): tids.append(tid)
+                    del(self._touches[tid])
+                #
+            #
+
+            if (not is_forced):
+                for tid in tids: self._open_window(tid, timestamp)
+            #
+        #
+
+        if (len(tids) > 0):
+            try:
+                if (self.outbox is None): self.client_pool.request("pas.tasks.Persistent.reregisterTimeoutMany", tids = tids)
+                else:
+                    for tid in tids: self.outbox.put("pas.tasks.Persistent.reregisterTimeoutMany", "tids", tid)
+                #
+            except Exception as handled_exception:
+                if (self._log_handler is not None): self._log_handler.error(handled_exception, context = "pas_tasks")
+            #
+        #
+    #
+
+    def _open_window(self, tid, timestamp):
+        """
+Opens a coalescing window for the given TID. The lock must be held.
+
+:param tid: Task ID
+:param timestamp: UNIX timestamp the window starts
+
+:since: v1.0.0
+        """
+
+        window_end = timestamp + self.window
+
+        self._touches[tid] = [ window_end, False ]
+        self._windows.append(( window_end, tid ))
+
+        if (len(self._windows) == 1): self._condition.notify()
+    #
+
+    def _run_flusher(self):
+        """
+Flushing thread loop sending pending touches at the end of their windows.
+
+:since: v1.0.0
+        """
+
+        while (True):
+            with self._condition:
+                while (self._is_started):
+                    if (len(self._windows) < 1): self._condition.wait()
+                    else:
+                        timeout = self._windows[0][0] - time()
+                        if (timeout <= 0): break
+
+                        self._condition.wait(timeout)
+                    #
+                #
+
+                is_started = self._is_started
+            #
+
+            self.flush(not is_started)
+            if (not is_started): break
+        #
+    #
+
+    def start(self):
+        """
+Starts the flushing thread.
+
+:since: v1.0.0
+        """
+
+        with self._condition:
+            if (not self._is_started):
+                self._is_started = True
+
+                thread = Thread(target = self._run_flusher)
+                thread.daemon = True
+                thread.start()
+            #
+        #
+    #
+
+    def stop(self):
+        """
+Stops the flushing thread after all pending touches have been sent.
+
+:since: v1.0.0
+        """
+
+        with self._condition:
+            if (self._is_started):
+                self._is_started = False
+                self._condition.notify_all()
+            #
+        #
+    #
+
+    def touch(self, tid):
+        """
+Records a touch of the given TID.
+
+:param tid: Task ID
+
+:return: (bool) True if the touch has been coalesced; False if it needs to
+         be sent by the caller
+:since:  v1.0.0
+        """
+
+        if (not self._is_started): self.start()
+
+        with self._condition:
+            timestamp = time()
+            touch = self._touches.get(tid)
+
+            _return = (touch is not None and touch[TouchCoalescer.TOUCH_WINDOW_END] > timestamp)
+
+            if (_return): touch[TouchCoalescer.TOUCH_IS_PENDING] = True
+            else: self._open_window(tid, timestamp)
+        #
+
+        return _return
+    #
+#
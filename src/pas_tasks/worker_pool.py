@@ -0,0 +1,483 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;tasks
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasTasksVersion)#
+#echo(__FILEPATH__)#
+"""
+
+from collections import deque
+from threading import Condition
+from time import time
+from weakref import ref
+
+from dpt_module_loader import NamedClassLoader
+from dpt_runtime.io_exception import IOException
+from dpt_runtime.value_exception import ValueException
+from dpt_settings import Settings
+from dpt_threading.instance_lock import InstanceLock
+from dpt_threading.thread import Thread
+
+class WorkerPool(object):
+    """
+A "WorkerPool" executes submitted calls with a bounded number of worker
+threads and a bounded queue.
+
+:author:     direct Netware Group et al.
+:copyright:  direct Netware Group - All rights reserved
+:package:    pas
+:subpackage: tasks
+:since:      v1.0.0
+:license:    https://www.direct-netware.de/redirect?licenses;gpl
+             GNU General Public License 2 or later
+    """
+
+    # pylint: disable=broad-except
+
+    REJECTION_POLICY_CALLER_RUNS = "caller_runs"
+    """
+Rejected calls are executed synchronously by the submitting thread
+    """
+    REJECTION_POLICY_RETURN = "return"
+    """
+Rejected calls are returned to the submitting caller for rescheduling
+    """
+    REJECTION_POLICY_DISCARD = "discard"
+    """
+Rejected calls are discarded
+    """
+    REJECTION_POLICY_EXCEPTION = "exception"
+    """
+Rejected calls raise an exception in the submitting thread
+    """
+
+    __slots__ = [ "__weakref__",
+                  "_condition",
+                  "_is_started",
+                  "_log_handler",
+                  "name",
+                  "_queue",
+                  "queue_size",
+                  "rejection_delay",
+                  "rejection_policy",
+                  "size",
+                  "_statistics",
+                  "_workers_count"
+                ]
+    """
+python.org: __slots__ reserves space for the declared variables and prevents
+the automatic creation of __dict__ and __weakref__ for each instance.
+    """
+    _instance_lock = InstanceLock()
+    """
+Thread safety lock
+    """
+    _is_stopped = False
+    """
+True if workers have been stopped. Calls submitted afterwards are refused
+until "start()" is called.
+    """
+    _weakref_instance = None
+    """
+WorkerPool weakref instance
+    """
+
+    def __init__(self, name = "pas_tasks", size = None, queue_size = None, rejection_policy = None, rejection_delay = None):
+        """
+Constructor __init__(WorkerPool)
+
+:param name: Worker pool name used for logging
+:param size: Number of worker threads; None to use the configured value
+:param queue_size: Maximum number of queued calls; 0 for an unbounded queue
+:param rejection_policy: Policy applied if the queue is full
+:param rejection_delay: Delay in seconds for rescheduling returned calls;
+                        None to use the configured value
+
+:since: v1.0.0
+        """
+
+        if (size is None): size = int(Settings.get("pas_tasks_worker_pool_size", 8))
+        if (queue_size is None): queue_size = int(Settings.get("pas_tasks_worker_pool_queue_size", 1024))
+        if (rejection_policy is None): rejection_policy = Settings.get("pas_tasks_worker_pool_rejection_policy", WorkerPool.REJECTION_POLICY_RETURN)
+        if (rejection_delay is None): rejection_delay = float(Settings.get("pas_tasks_worker_pool_rejection_delay", 1))
+
+        if (size < 1): raise ValueException("Worker pool size given is invalid")
+
+        if (rejection_policy not in ( WorkerPool.REJECTION_POLICY_CALLER_RUNS,
+                                      WorkerPool.REJECTION_POLICY_DISCARD,
+                                      WorkerPool.REJECTION_POLICY_EXCEPTION,
+                                      WorkerPool.REJECTION_POLICY_RETURN
+                                    )
+           ): raise ValueException("Worker pool rejection policy given is invalid")
+
+        self._condition = Condition()
+        """
+Condition used to notify waiting workers
+        """
+        self._is_started = False
+        """
+True if workers have been started
+        """
+        self._log_handler = NamedClassLoader.get_singleton("dpt_logging.LogHandler", False)
+        """
+The LogHandler is called whenever debug messages should be logged or errors
+happened.
+        """
+        self.name = name
+        """
+Worker pool name
+        """
+        self._queue = deque()
+        """
+Queue of calls waiting for execution
+        """
+        self.queue_size = queue_size
+        """
+Maximum number of queued calls
+        """
+        self.rejection_delay = rejection_delay
+        """
+Delay in seconds for rescheduling calls returned to the submitting caller
+        """
+        self.rejection_policy = rejection_policy
+        """
+Policy applied if the queue is full
+        """
+        self.size = size
+        """
+Number of worker threads
+        """
+        self._statistics = { "completed": 0,
+                             "execution_time": 0,
+                             "failed": 0,
+                             "queue_depth_max": 0,
+                             "queue_latency": 0,
+                             "queue_latency_max": 0,
+                             "rejected": 0,
+                             "submitted": 0
+                           }
+        """
+Counters of this worker pool
+        """
+        self._workers_count = 0
+        """
+Number of running worker threads
+        """
+    #
+
+    @property
+    def is_started(self):
+        """
+Returns true if the worker threads have been started.
+
+:return: (bool) True if started
+:since:  v1.0.0
+        """
+
+        return self._is_started
+    #
+
+    @property
+    def statistics(self):
+        """
+Returns the counters of this worker pool. Latency and execution time values
+are given in seconds.
+
+:return: (dict) Worker pool counters
+:since:  v1.0.0
+        """
+
+        with self._condition:
+            _return = self._statistics.copy()
+            _return['queue_depth'] = len(self._queue)
+        #
+
+        dequeued_count = _return['completed'] + _return['failed']
+
+        _return['queue_latency_average'] = (_return['queue_latency'] / dequeued_count
+                                            if (dequeued_count > 0) else
+                                            0
+                                           )
+
+        return _return
+    #
+
+    def _execute(self, target, args, kwargs):
+        """
+Executes the given call and updates the counters.
+
+:param target: Callable to execute
+:param args: Positional arguments
+:param kwargs: Keyword arguments
+
+:since: v1.0.0
+        """
+
+        is_failed = False
+        timestamp = time()
+
+        try: target(*args, **kwargs)
+        except Exception as handled_exception:
+            is_failed = True
+            if (self._log_handler is not None): self._log_handler.error(handled_exception, context = "pas_tasks")
+        #
+
+        execution_time = time() - timestamp
+
+        with self._condition:
+            self._statistics['execution_time'] += execution_time
+            self._statistics[("failed" if (is_failed) else "completed")] += 1
+        #
+    #
+
+    def _is_submittable(self, target):
+        """
+Checks if calls are accepted and starts the worker threads on demand.
+
+:param target: Callable to execute
+
+:return: (bool) True if calls are accepted
+:since:  v1.0.0
+        """
+
+        _return = (not WorkerPool._is_stopped)
+
+        if (not _return):
+            if (self._log_handler is not None): self._log_handler.warning("{0!r} refused call to {1!r} after being stopped", self, target, context = "pas_tasks")
+        elif (not self._is_started): self.start()
+
+        return _return
+    #
+
+    def _reject(self, target, args, kwargs):
+        """
+Applies the rejection policy to the given call.
+
+:param target: Callable to execute
+:param args: Positional arguments
+:param kwargs: Keyword arguments
+
+:return: (bool) True if the call has been executed or discarded; False if
+         returned to the submitting caller
+:since:  v1.0.0
+        """
+
+        _return = True
+
+        if (self.rejection_policy == WorkerPool.REJECTION_POLICY_EXCEPTION): raise IOException("Worker pool '{0}' queue is full".format(self.name))
+
+        if (self.rejection_policy == WorkerPool.REJECTION_POLICY_CALLER_RUNS): self._execute(target, args, kwargs)
+        elif (self.rejection_policy == WorkerPool.REJECTION_POLICY_RETURN): _return = False
+        elif (self._log_handler is not None): self._log_handler.warning("{0!r} discarded call to {1!r}", self, target, context = "pas_tasks")
+
+        return _return
+    #
+
+    def _run_worker(self):
+        """
+Worker thread loop executing queued calls.
+
+:since: v1.0.0
+        """
+
+        while (True):
+            with self._condition:
+                while (self._is_started and len(self._queue) < 1): self._condition.wait()
+
+                if (len(self._queue) < 1):
+                    self._workers_count -= 1
+                    break
+                #
+
+                ( target, args, kwargs, timestamp_queued ) = self._queue.popleft()
+                queue_latency = time() - timestamp_queued
+
+                self._statistics['queue_latency'] += queue_latency
+                if (queue_latency > self._statistics['queue_latency_max']): self._statistics['queue_latency_max'] = queue_latency
+            #
+
+            self._execute(target, args, kwargs)
+        #
+    #
+
+    def start(self):
+        """
+Starts the worker threads.
+
+:since: v1.0.0
+        """
+
+        with WorkerPool._instance_lock: WorkerPool._is_stopped = False
+
+        with self._condition:
+            if (not self._is_started):
+                self._is_started = True
+
+                for _ in range(self._workers_count, self.size):
+                    thread = Thread(target = self._run_worker)
+                    thread.daemon = True
+                    thread.start()
+
+                    self._workers_count += 1
+                #
+
+                if (self._log_handler is not None): self._log_handler.debug("{0!r} started {1:d} workers", self, self.size, context = "pas_tasks")
+            #
+        #
+    #
+
+    def stop(self):
+        """
+Stops the worker threads after all queued calls have been executed. Calls
+are refused until "start()" is called again.
+
+:since: v1.0.0
+        """
+
+        with WorkerPool._instance_lock: WorkerPool._is_stopped = True
+
+        with self._condition:
+            if (self._is_started):
+                self._is_started = False
+                self._condition.notify_all()
+
+                if (self._log_handler is not None): self._log_handler.debug("{0!r} stops workers", self, context = "pas_tasks")
+            #
+        #
+    #
+
+    def submit(self, target, args = None, kwargs = None):
+        """
+Queues the given call for execution by a worker thread.
+
+:param target: Callable to execute
+:param args: Positional arguments tuple
+:param kwargs: Keyword arguments dict
+
+:return: (bool) True if the call has been queued, executed or discarded;
+         False if refused or returned
+:since:  v1.0.0
+        """
+
+        if (args is None): args = ( )
+        if (kwargs is None): kwargs = { }
+
+        _return = self._is_submittable(target)
+
+        if (_return):
+            with self._condition:
+                queue_depth = len(self._queue)
+                is_rejected = (self.queue_size > 0 and queue_depth >= self.queue_size)
+
+                if (is_rejected): self._statistics['rejected'] += 1
+                else:
+                    self._queue.append(( target, args, kwargs, time() ))
+                    queue_depth += 1
+
+                    self._statistics['submitted'] += 1
+                    if (queue_depth > self._statistics['queue_depth_max']): self._statistics['queue_depth_max'] = queue_depth
+
+                    self._condition.notify()
+                #
+            #
+
+            if (is_rejected): _return = self._reject(target, args, kwargs)
+        #
+
+        return _return
+    #
+
+    def submit_many(self, target, args_list):
+        """
+Queues a call of the given target for each positional arguments tuple
+given. Calls exceeding the queue size are handled based on the rejection
+policy.
+
+:param target: Callable to execute
+:param args_list: List of positional arguments tuples
+
+:return: (int) Number of calls queued, executed or discarded. Calls
+         refused or returned are always the last ones given.
+:since:  v1.0.0
+        """
+
+        _return = 0
+
+        if (self._is_submittable(target)):
+            rejected_args_list = [ ]
+
+            with self._condition:
+                queue_depth = len(self._queue)
+                timestamp = time()
+
+                for args in args_list:
+                    if (self.queue_size > 0 and queue_depth >= self.queue_size): rejected_args_list.append(args)
+                    else:
+                        self._queue.append(( target, args, { }, timestamp ))
+                        queue_depth += 1
+                        _return += 1
+                    #
+                #
+
+                self._statistics['rejected'] += len(rejected_args_list)
+                self._statistics['submitted'] += _return
+                if (queue_depth > self._statistics['queue_depth_max']): self._statistics['queue_depth_max'] = queue_depth
+
+                if (_return > 0): self._condition.notify(_return)
+            #
+
+            for args in rejected_args_list:
+                if (self._reject(target, args, { })): _return += 1
+            #
+        #
+
+        return _return
+    #
+
+    @staticmethod
+    def get_instance():
+        """
+Get the WorkerPool singleton.
+
+:return: (WorkerPool) Object on success
+:since:  v1.0.0
+        """
+
+        _return = None
+
+        with WorkerPool._instance_lock:
+            if (WorkerPool._weakref_instance is not None): _return = WorkerPool._weakref_instance()
+
+            if (_return is None):
+                _return = WorkerPool()
+                WorkerPool._weakref_instance = ref(_return)
+            #
+        #
+
+        return _return
+    #
+#
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;tasks
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasTasksVersion)#
+#echo(__FILEPATH__)#
+"""
+
+
+from threading import Event
+import unittest
+
+from pas_tasks.tasks.lrt_executor import LrtExecutor
+
+class _Task(object):
+    """
+LRT hook recording its execution.
+    """
+
+    def __init__(self, name, executed, release_event):
+        """
+Constructor __init__(_Task)
+        """
+
+        self.executed = executed
+        self.name = name
+        self.release_event = release_event
+        self.started_event = Event()
+    #
+
+    def _run_hook(self):
+        """
+Records the execution and blocks until the test releases it.
+        """
+
+        self.executed.append(self.name)
+        self.started_event.set()
+
+        self.release_event.wait(2)
+    #
+#
+
+class TestLrtExecutor(unittest.TestCase):
+    """
+UnitTest for LrtExecutor
+
+:since: v1.0.0
+    """
+
+    def setUp(self):
+        """
+Creates the LRT executor tested.
+        """
+
+        self.executed = [ ]
+        self.executor = LrtExecutor(1)
+        self.release_event = Event()
+    #
+
+    def tearDown(self):
+        """
+Stops the LRT executor tested.
+        """
+
+        self.release_event.set()
+        self.executor.stop()
+    #
+
+    def _get_task(self, name):
+        """
+Returns a new task recording its execution.
+        """
+
+        return _Task(name, self.executed, self.release_event)
+    #
+
+    def test_admission_queue_full(self):
+        """
+Independently scheduled tasks of an active context are rejected if the
+admission queue is full.
+        """
+
+        self.executor.admission_queue_size = 1
+
+        task = self._get_task("task1")
+        self.assertTrue(self.executor.submit("context", task))
+        self.assertTrue(task.started_event.wait(2))
+
+        self.assertTrue(self.executor.submit("context", self._get_task("task2"), True))
+        self.assertFalse(self.executor.submit("context", self._get_task("task3"), True))
+        self.assertEqual(self.executor.queued_count, 1)
+    #
+
+    def test_context_queue_full(self):
+        """
+Tasks of an active context are rejected if the context queue is full.
+        """
+
+        self.executor.context_queue_size = 1
+
+        task = self._get_task("task1")
+        self.assertTrue(self.executor.submit("context", task))
+        self.assertTrue(task.started_event.wait(2))
+
+        self.assertTrue(self.executor.submit("context", self._get_task("task2")))
+        self.assertFalse(self.executor.submit("context", self._get_task("task3")))
+        self.assertTrue(self.executor.submit("other_context", self._get_task("task4")))
+
+        self.assertEqual(self.executor.queued_count, 2)
+    #
+
+    def test_round_robin(self):
+        """
+Contexts take turns in executing their queued tasks.
+        """
+
+        task = self._get_task("a1")
+        self.assertTrue(self.executor.submit("a", task))
+        self.assertTrue(task.started_event.wait(2))
+
+        self.executor.submit("a", self._get_task("a2"))
+        self.executor.submit("b", self._get_task("b1"))
+
+        task = self._get_task("a3")
+        self.executor.submit("a", task)
+
+        self.release_event.set()
+        self.assertTrue(task.started_event.wait(2))
+
+        self.assertEqual(self.executed, [ "a1", "b1", "a2", "a3" ])
+    #
+#
+
+if (__name__ == "__main__"): unittest.main()
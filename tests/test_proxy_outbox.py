@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;tasks
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasTasksVersion)#
+#echo(__FILEPATH__)#
+"""
+
+from threading import Event
+from time import sleep
+import unittest
+
+from pas_tasks.persistent_proxy import PersistentProxy
+from pas_tasks.proxy_outbox import ProxyOutbox
+
+class _ClientPool(object):
+    """
+Bus client pool recording requests sent.
+    """
+
+    def __init__(self):
+        """
+Constructor __init__(_ClientPool)
+        """
+
+        self.requests = [ ]
+        self.requested_event = Event()
+    #
+
+    def request(self, *args, **kwargs):
+        """
+Records the given request.
+        """
+
+        self.requests.append(( args, kwargs ))
+        self.requested_event.set()
+    #
+
+    def disconnect(self):
+        """
+Closes all idle connections.
+        """
+
+        pass
+    #
+#
+
+class TestProxyOutbox(unittest.TestCase):
+    """
+UnitTest for ProxyOutbox
+
+:since: v1.0.0
+    """
+
+    def setUp(self):
+        """
+Creates the outbox tested.
+        """
+
+        self.client_pool = _ClientPool()
+        self.outbox = ProxyOutbox(self.client_pool, size = 16, batch_size = 100, flush_interval = 0.1)
+    #
+
+    def tearDown(self):
+        """
+Stops the outbox tested.
+        """
+
+        self.outbox.stop()
+    #
+
+    def test_put_below_batch_size_while_idle(self):
+        """
+Requests queued below the batch size after the flushing thread has sent
+all queued ones are sent within the flush interval.
+        """
+
+        self.outbox.put("pas.tasks.Persistent.reregisterTimeoutMany", "tids", "tid1")
+        self.assertTrue(self.client_pool.requested_event.wait(2))
+
+        # Let the flushing thread wait for new requests
+        sleep(0.3)
+        self.client_pool.requested_event.clear()
+
+        self.outbox.put("pas.tasks.Persistent.reregisterTimeoutMany", "tids", "tid2")
+        self.assertTrue(self.client_pool.requested_event.wait(2))
+
+        self.assertEqual(self.client_pool.requests,
+                         [ (( "pas.tasks.Persistent.reregisterTimeoutMany", ), { "tids": [ "tid1" ] }),
+                           (( "pas.tasks.Persistent.reregisterTimeoutMany", ), { "tids": [ "tid2" ] })
+                         ]
+                        )
+    #
+
+    def test_request_after_put(self):
+        """
+Queued one-way requests are sent before a synchronous request of the
+proxy.
+        """
+
+        self.outbox.flush_interval = 10
+
+        proxy = PersistentProxy()
+        proxy.is_one_way = True
+
+        PersistentProxy._client_pool = self.client_pool
+        PersistentProxy._outbox = self.outbox
+
+        try:
+            proxy.register_timeout("tid1", "test.hook", 60)
+            proxy.is_registered("tid1")
+        finally: PersistentProxy.shutdown()
+
+        self.assertEqual(self.client_pool.requests,
+                         [ (( "pas.tasks.Persistent.registerTimeoutMany", ),
+                            { "tasks": [ { "hook": "test.hook", "kwargs": { }, "tid": "tid1", "timeout": 60 } ] }
+                           ),
+                           (( "pas.tasks.Persistent.isRegistered", ), { "tid": "tid1" })
+                         ]
+                        )
+    #
+#
+
+if (__name__ == "__main__"): unittest.main()
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;tasks
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasTasksVersion)#
+#echo(__FILEPATH__)#
+"""
+
+from random import Random
+import unittest
+
+from pas_tasks.schedulers import Heap, TimingWheel
+
+class TestSchedulers(unittest.TestCase):
+    """
+UnitTest comparing the "TimingWheel" scheduler with the "Heap" one
+
+:since: v1.0.0
+    """
+
+    def _assert_popped_equal(self, heap_tasks, wheel_tasks):
+        """
+Asserts that both schedulers returned the same tasks in the order of
+activation. The order of tasks with the same UNIX timestamp is not defined.
+        """
+
+        self.assertEqual(sorted(task['tid'] for task in heap_tasks), sorted(task['tid'] for task in wheel_tasks))
+
+        timestamps = [ task['timestamp'] for task in wheel_tasks ]
+        self.assertEqual(timestamps, sorted(timestamps))
+    #
+
+    def _run_differential(self, seed, resolution, timestamp_offsets):
+        """
+Applies the same random operations to both schedulers and compares the
+tasks activated.
+        """
+
+        random = Random(seed)
+
+        heap = Heap()
+        wheel = TimingWheel(resolution)
+        timestamp = wheel._tick * resolution
+
+        for _ in range(5000):
+            operation = random.random()
+            tid = "t{0:d}".format(random.randrange(500))
+
+            if (operation < 0.5):
+                task_timestamp = timestamp + random.choice(timestamp_offsets)()
+                task = { "tid": tid, "timestamp": task_timestamp }
+
+                self.assertEqual(heap.get(tid) is None, wheel.get(tid) is None)
+
+                heap.add(tid, task_timestamp, task)
+                wheel.add(tid, task_timestamp, dict(task))
+            elif (operation < 0.6):
+                if (heap.get(tid) is not None):
+                    task_timestamp = timestamp + random.choice(timestamp_offsets)()
+
+                    heap.get(tid)['timestamp'] = task_timestamp
+                    wheel.get(tid)['timestamp'] = task_timestamp
+
+                    heap.reschedule(tid, task_timestamp)
+                    wheel.reschedule(tid, task_timestamp)
+                #
+            elif (operation < 0.7): self.assertEqual(heap.remove(tid), wheel.remove(tid))
+            else:
+                timestamp += random.choice(( 0, resolution, 3 * resolution, 300 * resolution, 100000 * resolution ))
+                limit = random.choice(( 0, 0, 5 ))
+
+                self._assert_popped_equal(heap.pop_due(timestamp, limit), wheel.pop_due(timestamp, limit))
+            #
+
+            self.assertEqual(len(heap), len(wheel))
+
+            if (len(heap) > 0):
+                self.assertLessEqual(wheel.next_timestamp, max(heap.next_timestamp, timestamp))
+            else: self.assertEqual(wheel.next_timestamp, -1)
+        #
+    #
+
+    def test_empty(self):
+        """
+Empty schedulers return no tasks.
+        """
+
+        for scheduler in ( Heap(), TimingWheel(1) ):
+            self.assertEqual(len(scheduler), 0)
+            self.assertEqual(scheduler.next_timestamp, -1)
+            self.assertEqual(scheduler.pop_due(2 ** 40), [ ])
+            self.assertFalse(scheduler.remove("tid"))
+        #
+    #
+
+    def test_heap_order(self):
+        """
+Tasks with the same UNIX timestamp are activated in the order they have
+been scheduled.
+        """
+
+        heap = Heap()
+
+        for tid in ( "c", "a", "b" ): heap.add(tid, 10, tid)
+        heap.add("d", 5, "d")
+        heap.reschedule("c", 10)
+
+        self.assertEqual(heap.next_timestamp, 5)
+        self.assertEqual(heap.pop_due(10, 2), [ "d", "a" ])
+        self.assertEqual(heap.pop_due(10), [ "b", "c" ])
+    #
+
+    def test_timing_wheel_tick_rounding(self):
+        """
+Tasks are not activated before their UNIX timestamp and at most one tick
+later.
+        """
+
+        wheel = TimingWheel(0.5)
+        timestamp = wheel._tick * 0.5
+
+        wheel.add("a", timestamp + 1.2, "a")
+        wheel.add("b", timestamp + 1.5, "b")
+
+        self.assertEqual(wheel.pop_due(timestamp + 1.1), [ ])
+        self.assertEqual(wheel.pop_due(timestamp + 1.49), [ ])
+        self.assertEqual(wheel.pop_due(timestamp + 1.5), [ "a", "b" ])
+    #
+
+    def test_timing_wheel_large_time_jump(self):
+        """
+Far future tasks are activated after a large time jump without processing
+every tick.
+        """
+
+        wheel = TimingWheel(0.001)
+        timestamp = wheel._tick * 0.001
+
+        for index in range(100): wheel.add("t{0:d}".format(index), timestamp + index * 100000, index)
+
+        self.assertEqual(wheel.pop_due(timestamp + 50 * 100000), list(range(51)))
+        self.assertEqual(len(wheel), 49)
+    #
+
+    def test_differential_fractional_timestamps(self):
+        """
+Tasks with fractional UNIX timestamps are activated like by the "Heap"
+scheduler if the current UNIX timestamp is a tick boundary.
+        """
+
+        offsets = ( lambda: -2.5, lambda: 0.25, lambda: 7.75, lambda: 1000.5, lambda: 10 ** 6 + 0.5 )
+
+        for seed in range(3): self._run_differential(seed, 0.25, offsets)
+    #
+
+    def test_differential_integer_timestamps(self):
+        """
+Tasks with integer UNIX timestamps are activated like by the "Heap"
+scheduler.
+        """
+
+        random = Random(42)
+
+        offsets = ( lambda: random.randint(-5, 5),
+                    lambda: random.randint(0, 300),
+                    lambda: random.randint(0, 100000),
+                    lambda: random.randint(0, 5 * 10 ** 7)
+                  )
+
+        for seed in range(3): self._run_differential(seed, 1, offsets)
+    #
+#
+
+if (__name__ == "__main__"): unittest.main()
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;tasks
+
+The following license agreement remains valid unless any additions or
+changes are being made by direct Netware Group in a written form.
+
+This program is free software; you can redistribute it and/or modify it
+under the terms of the GNU General Public License as published by the
+Free Software Foundation; either version 2 of the License, or (at your
+option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+more details.
+
+You should have received a copy of the GNU General Public License along with
+this program; if not, write to the Free Software Foundation, Inc.,
+51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;gpl
+----------------------------------------------------------------------------
+#echo(pasTasksVersion)#
+#echo(__FILEPATH__)#
+"""
+
+
+from threading import Event
+from weakref import ref
+import unittest
+
+from pas_tasks.abstract import Abstract
+from pas_tasks.worker_pool import WorkerPool
+
+class _Tasks(Abstract):
+    """
+Task store recording tasks added.
+    """
+
+    __slots__ = [ "added", "executed_event", "release_event" ]
+
+    def __init__(self):
+        """
+Constructor __init__(_Tasks)
+        """
+
+        Abstract.__init__(self)
+
+        self.added = [ ]
+        self.executed_event = Event()
+        self.release_event = Event()
+    #
+
+    def add(self, tid, hook, timeout = None, **kwargs):
+        """
+Records the given task.
+        """
+
+        self.added.append(( tid, hook, timeout, kwargs ))
+    #
+
+    def _run_task(self, task_data):
+        """
+Blocks until the test releases the worker.
+        """
+
+        self.executed_event.set()
+        self.release_event.wait(2)
+    #
+#
+
+class TestWorkerPool(unittest.TestCase):
+    """
+UnitTest for WorkerPool
+
+:since: v1.0.0
+    """
+
+    def setUp(self):
+        """
+Creates the worker pool tested.
+        """
+
+        self.pool = WorkerPool("test", size = 1, queue_size = 1, rejection_policy = WorkerPool.REJECTION_POLICY_RETURN, rejection_delay = 5)
+        self.pool.start()
+    #
+
+    def tearDown(self):
+        """
+Stops the worker pool tested.
+        """
+
+        self.pool.stop()
+        WorkerPool._weakref_instance = None
+    #
+
+    def test_submit_keyword_named_target(self):
+        """
+Keyword arguments named like a "submit()" parameter are passed to the call.
+        """
+
+        executed_event = Event()
+        results = [ ]
+
+        def _run(target = None, **kwargs):
+            results.append(( target, kwargs ))
+            executed_event.set()
+        #
+
+        self.assertTrue(self.pool.submit(_run, kwargs = { "target": "value", "args": 1 }))
+        self.assertTrue(executed_event.wait(2))
+
+        self.assertEqual(results, [ ( "value", { "args": 1 } ) ])
+    #
+
+    def test_rejection_policy_return(self):
+        """
+Calls exceeding the queue size are returned to the submitting caller.
+        """
+
+        release_event = Event()
+        started_event = Event()
+
+        def _block():
+            started_event.set()
+            release_event.wait(2)
+        #
+
+        self.assertTrue(self.pool.submit(_block))
+        self.assertTrue(started_event.wait(2))
+
+        self.assertTrue(self.pool.submit(release_event.wait))
+        self.assertFalse(self.pool.submit(release_event.wait))
+        self.assertEqual(self.pool.submit_many(release_event.wait, [ ( ), ( ) ]), 0)
+
+        release_event.set()
+
+        self.assertEqual(self.pool.statistics['rejected'], 3)
+    #
+
+    def test_start_tasks_deferred(self):
+        """
+Tasks returned by the worker pool are added again with the rejection delay.
+        """
+
+        tasks = _Tasks()
+        WorkerPool._weakref_instance = ref(self.pool)
+
+        tasks._start_tasks([ { "hook": "test.hook", "params": { "_tid": "tid1" }, "tid": "tid1" } ])
+        self.assertTrue(tasks.executed_event.wait(2))
+
+        tasks._start_tasks([ { "hook": "test.hook", "params": { "_tid": "tid{0:d}".format(i) }, "tid": "tid{0:d}".format(i) }
+                             for i in range(2, 5)
+                           ])
+
+        tasks.release_event.set()
+
+        self.assertEqual(tasks.added,
+                         [ ( "tid3", "test.hook", 5, { "_tid": "tid3" } ),
+                           ( "tid4", "test.hook", 5, { "_tid": "tid4" } )
+                         ]
+                        )
+    #
+
+    def test_submit_after_stop(self):
+        """
+Calls submitted after "stop()" are refused until "start()" is called again.
+        """
+
+        executed_event = Event()
+
+        self.pool.stop()
+
+        self.assertFalse(self.pool.submit(executed_event.set))
+        self.assertEqual(self.pool.submit_many(executed_event.set, [ ( ), ( ) ]), 0)
+        self.assertFalse(self.pool.is_started)
+        self.assertFalse(executed_event.wait(0.2))
+
+        self.pool.start()
+
+        self.assertTrue(self.pool.submit(executed_event.set))
+        self.assertTrue(executed_event.wait(2))
+    #
+#
+
+if (__name__ == "__main__"): unittest.main()